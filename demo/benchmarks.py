@@ -0,0 +1,144 @@
+"""Benchmarks backing the performance-related defaults of the shmistogram package.
+
+Run as python demo/benchmarks.py [name ...], where each name is one of the benchmarks in BENCHMARKS (default: all).
+"""
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+from pandahandler.tabulation import tabulate
+
+from shmistogram.binners.agglomerate import Agglomerator
+from shmistogram.binners.det import DensityEstimationTree
+from shmistogram.counting import BINCOUNT_RANGE_RATIO, count_integers, fast_tabulate
+from shmistogram.render import render_many
+from shmistogram.shmistogram import Shmistogram
+from shmistogram.simulations.univariate import cauchy_mixture
+from shmistogram.validation import FAST, FULL, validation
+
+
+def best_time(func, *args, repeat: int = 3) -> float:
+    """The best wall-clock time, in seconds, over `repeat` calls of func(*args)."""
+    best = np.inf
+    for _ in range(repeat):
+        t0 = perf_counter()
+        func(*args)
+        best = min(best, perf_counter() - t0)
+    return best
+
+
+def tabulation() -> pd.DataFrame:
+    """Compare hash-based (pandas), sort-based (np.unique), and bincount tabulation.
+
+    Motivates `shmistogram.counting.BINCOUNT_RANGE_RATIO`: bincount wins only while the integer range is at most that
+    multiple of the sample size, and np.unique beats pandas' value_counts across the board for numeric data. Bincount
+    is timed up to twice that range to show the crossover.
+    """
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in [10_000, 1_000_000]:
+        cases = {
+            "int range 100": rng.integers(0, 100, n),
+            "int range n": rng.integers(0, n, n),
+            "int range 2n": rng.integers(0, 2 * n, n),
+            "int range 1e9": rng.integers(0, 10**9, n),
+            "float continuous": rng.normal(size=n),
+            "float rounded": np.round(rng.normal(size=n), 2),
+        }
+        for name, x in cases.items():
+            small_range = x.dtype.kind == "i" and x.max() - x.min() <= 2 * BINCOUNT_RANGE_RATIO * n
+            rows.append(
+                {
+                    "n": n,
+                    "data": name,
+                    "pandas": best_time(tabulate, x),
+                    "unique": best_time(np.unique, x, False, False, True),
+                    "bincount": best_time(count_integers, x) if small_range else np.nan,
+                    "fast_tabulate": best_time(fast_tabulate, x),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def rendering(n_images: int = 48) -> pd.DataFrame:
+    """Images per second rendered by `render_many`, in-process and across a pool of one process per CPU."""
+    rng = np.random.default_rng(0)
+    shms = [Shmistogram(np.concatenate([rng.normal(size=1000), [0.0] * 50])) for _ in range(n_images)]
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        outfiles = [os.path.join(tmp, f"{k}.png") for k in range(n_images)]
+        for max_workers in sorted({1, os.cpu_count() or 1}):
+            seconds = best_time(render_many, shms, outfiles, max_workers, repeat=1)
+            rows.append({"max_workers": max_workers, "images_per_second": n_images / seconds})
+    return pd.DataFrame(rows)
+
+
+def holdout_log_likelihood(bins: pd.DataFrame, x: np.ndarray) -> float:
+    """Mean log density of held-out points under the piecewise-uniform density of the bins."""
+    edges = np.append(bins["lb"].to_numpy()[:1], bins["ub"].to_numpy())
+    density = bins["rate"].to_numpy() / bins["freq"].sum()
+    idx = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, density.shape[0] - 1)
+    return float(np.mean(np.log(density[idx])))
+
+
+def agglomeration(size: int = 20_000) -> pd.DataFrame:
+    """Speed and held-out log likelihood of exact (one merge per round) versus batched agglomeration."""
+    train = cauchy_mixture(size=size, truncate=True, seed=0)
+    test = cauchy_mixture(size=size, truncate=True, seed=1)
+    test = test[(test > train.min()) & (test < train.max())]
+    values, counts = np.unique(train, return_counts=True)
+    rows = []
+    for prebin_maxbins in [100, 1000, 5000]:
+        for batch in [False, True]:
+            binner = Agglomerator(n_bins=30, prebin_maxbins=prebin_maxbins, batch=batch)
+            seconds = best_time(binner.fit_arrays, values, counts, repeat=1)
+            rows.append(
+                {
+                    "prebin_maxbins": prebin_maxbins,
+                    "batch": batch,
+                    "seconds": seconds,
+                    "n_bins": binner.bins.shape[0],
+                    "holdout_log_likelihood": holdout_log_likelihood(binner.bins, test),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def validation_levels() -> pd.DataFrame:
+    """Fit time of large fits at the fast versus the full validation level (see `shmistogram.validation`)."""
+    rng = np.random.default_rng(0)
+    rows = []
+    for size in [100_000, 1_000_000]:
+        values, counts = np.unique(rng.normal(size=size), return_counts=True)
+        binners = {
+            "det": DensityEstimationTree(),
+            "det, max 1000 bins": DensityEstimationTree(max_bins=1000, lambda_=0.0),
+            "agglomerator": Agglomerator(n_bins=30, prebin_maxbins=2000),
+        }
+        for name, binner in binners.items():
+            row = {"size": size, "binner": name}
+            for level in [FULL, FAST]:
+                # Agglomerating large counts overflows exp() in `rate_similarity`, harmlessly
+                with validation(level), np.errstate(over="ignore"):
+                    row[level] = best_time(binner.fit_arrays, values, counts, repeat=1)
+            row["speedup"] = row[FULL] / row[FAST]
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+BENCHMARKS = {
+    "tabulation": tabulation,
+    "rendering": rendering,
+    "agglomeration": agglomeration,
+    "validation_levels": validation_levels,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or list(BENCHMARKS):
+        print(f"\n# {name}")
+        print(BENCHMARKS[name]().to_string(index=False))
@@ -1,7 +1,9 @@
 from importlib.metadata import version
 
+from shmistogram.cache import ShmistogramCache as ShmistogramCache
 from shmistogram.plot import ShmistoGrammer as ShmistoGrammer
 from shmistogram.plot import standard_histogram as standard_histogram
 from shmistogram.shmistogram import Shmistogram as Shmistogram
+from shmistogram.shmistogram2d import Shmistogram2D as Shmistogram2D
 
 __version__ = version("shmistogram")
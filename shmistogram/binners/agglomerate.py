@@ -1,12 +1,15 @@
 """Agglomerative binning for shmistograms."""
 
 from dataclasses import dataclass
+from typing import ClassVar
 
 import numpy as np
 import pandas as pd
 from scipy import stats
 
-from shmistogram.names import COUNT, LB, UB
+from shmistogram.binners.base import BinnerCapabilities, check_cancelled, frame_arrays
+from shmistogram.names import LB, UB
+from shmistogram.validation import full_validation
 
 
 def rate_similarity(n1, w1, n2, w2):
@@ -48,13 +51,10 @@ def forward_merge_score(bins):
     :param bins: (pandas.DataFrame) contains columns 'freq', 'width', and 'rate';
     each row is a bin
     """
-    # rate sameness
-    s = np.array(
-        [
-            rate_similarity(bins.freq[k], bins.width[k], bins.freq[k + 1], bins.width[k + 1])
-            for k in range(bins.shape[0] - 1)
-        ]
-    )
+    # rate sameness, for all neighboring pairs at once
+    freq = bins.freq.to_numpy()
+    width = bins.width.to_numpy()
+    s = rate_similarity(freq[:-1], width[:-1], freq[1:], width[1:])
     # contribution to mass balance
     mr = bins.freq.rank(pct=True).to_numpy()
     m = 1 - mr[1:] * mr[:-1]
@@ -83,13 +83,59 @@ def collapse_one(bins, k):
         },
         index=pd.RangeIndex(1),
     )
-    assert (df.ub - df.lb).min() > 0
+    if full_validation():
+        assert (df.ub - df.lb).min() > 0
     df["width"] = df.ub - df.lb
     df["rate"] = df.freq / df.width
     bins_minus_one = pd.concat([bins.iloc[:k], df, bins.iloc[k + 2 :]]).reset_index(drop=True)
     return bins_minus_one
 
 
+def select_batch_merges(fms, quantile, max_merges):
+    """Choose a set of non-adjacent merges to perform at once.
+
+    A pair is merged if its score is at least the `quantile` of all scores and is a local maximum: strictly
+    greater than the score of its left neighbor and no less than that of its right neighbor. Two neighboring pairs
+    can never both be local maxima in this sense, so no bin is involved in more than one merge.
+
+    :param fms: forward merge scores, as from `forward_merge_score`
+    :param quantile: only pairs scoring at least this quantile of all scores are merged
+    :param max_merges: if more pairs qualify, keep only the `max_merges` best
+    :return: sorted indexes k of the pairs (k, k+1) to merge
+    """
+    left = np.concatenate([[-np.inf], fms[:-1]])
+    right = np.concatenate([fms[1:], [-np.inf]])
+    ks = np.flatnonzero((fms >= np.quantile(fms, quantile)) & (fms > left) & (fms >= right))
+    if ks.shape[0] > max_merges:
+        ks = np.sort(ks[np.argsort(-fms[ks], kind="stable")[:max_merges]])
+    return ks
+
+
+def collapse_many(bins, ks):
+    """Collapse the kth and (k+1)th rows of the bins DataFrame for each of several non-adjacent k.
+
+    :param bins: (pandas.DataFrame) contains columns 'lb', 'ub', 'freq', 'width', and 'rate';
+    each row is a bin
+    :param ks: sorted indexes of rows to collapse with the following row; no two may be adjacent
+    :return: same as bins but len(ks) fewer rows due to collapsing
+    """
+    nrow = bins.shape[0]
+    merges_into_previous = np.zeros(nrow, dtype=bool)
+    merges_into_previous[np.asarray(ks) + 1] = True
+    starts = np.flatnonzero(~merges_into_previous)
+    stops = np.append(starts[1:], nrow) - 1
+    df = pd.DataFrame(
+        {
+            LB: bins.lb.to_numpy()[starts],
+            UB: bins.ub.to_numpy()[stops],
+            "freq": np.add.reduceat(bins.freq.to_numpy(), starts),
+        }
+    )
+    df["width"] = df.ub - df.lb
+    df["rate"] = df.freq / df.width
+    return df
+
+
 @dataclass
 class Agglomerator:
     """Agglomerative binning for shmistograms.
@@ -101,10 +147,21 @@ class Agglomerator:
     Attributes:
         n_bins: hard upper bound on the number of bins in the continuous component of the shmistogram.
         prebin_maxbins: pre-bin the points as you would in a standard histogram with at most.
+        batch: merge many non-adjacent pairs of bins per round (see `select_batch_merges`) instead of only the
+            best-scoring pair, reducing the number of bins geometrically. The final number of bins is the same,
+            but the result is an approximation of the one-merge-at-a-time result.
+        merge_quantile: in batch mode, only pairs whose merge score is at least this quantile of all scores in the
+            round are merged.
+        release_data: drop the training data after each fit (see `drop_training_data`).
     """
 
     n_bins: int | None = None
     prebin_maxbins: int = 100
+    batch: bool = False
+    merge_quantile: float = 0.5
+    release_data: bool = False
+
+    capabilities: ClassVar[BinnerCapabilities] = BinnerCapabilities(supports_weights=True)
 
     def fit(self, df):
         """Given a DataFrame with columns 'n_obs' and 'value', return a DataFrame.
@@ -112,32 +169,54 @@ class Agglomerator:
         Args:
             df: DataFrame with columns 'n_obs' and 'value'
         """
-        self.N = df[COUNT].sum()
-        self.df = df
+        return self.fit_arrays(*frame_arrays(df))
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Agglomerate bins over sorted distinct values and their counts.
+
+        Args:
+            values: Sorted distinct values
+            counts: Number of observations of each value
+        """
+        self.N = counts.sum()
+        self.values = values
+        self.counts = counts
         self._bins_init()
-        if self.n_bins is None:
-            nrow = self.df.shape[0]
-            self.n_bins = round(np.log(nrow + 1) ** 1.5)
-        while self.bins.shape[0] > self.n_bins:
+        n_bins = self.n_bins
+        if n_bins is None:
+            n_bins = round(np.log(values.shape[0] + 1) ** 1.5)
+        while self.bins.shape[0] > n_bins:
+            check_cancelled()
             fms = forward_merge_score(self.bins)
-            self.bins = collapse_one(self.bins, np.argmax(fms))
+            if self.batch:
+                ks = select_batch_merges(fms, self.merge_quantile, max_merges=self.bins.shape[0] - n_bins)
+                self.bins = collapse_many(self.bins, ks)
+            else:
+                self.bins = collapse_one(self.bins, np.argmax(fms))
+        if self.release_data:
+            self.drop_training_data()
         return self.bins
 
-    def _bin_init(self, xs):
-        df = self.df.iloc[xs]
-        stats_dict = {LB: df.index.min(), UB: df.index.max(), "freq": df[COUNT].sum()}
-        return stats_dict
+    def drop_training_data(self) -> None:
+        """Drop the training values and counts, keeping only the fitted bins."""
+        self.__dict__.pop("values", None)
+        self.__dict__.pop("counts", None)
 
     def _bins_init(self):
         # Prior to beginning any agglomeration routine, we do a coarse pre-binning
         #   by simple dividing the data into approximately equal-sized groups (leading
         #   to non-uniform bin widths)
-        nc = self.df.shape[0]
+        nc = self.values.shape[0]
         if nc == 0:
-            return pd.DataFrame({"freq": [], LB: [], UB: [], "width": [], "rate": []})
+            self.bins = pd.DataFrame({"freq": [], LB: [], UB: [], "width": [], "rate": []})
+            return
         prebin_maxbins = min(nc, self.prebin_maxbins)
         bin_idxs = np.array_split(np.arange(nc), prebin_maxbins)
-        bins = pd.DataFrame([self._bin_init(xs.tolist()) for xs in bin_idxs])
+        starts = np.array([xs[0] for xs in bin_idxs])
+        stops = np.array([xs[-1] for xs in bin_idxs])
+        bins = pd.DataFrame(
+            {LB: self.values[starts], UB: self.values[stops], "freq": np.add.reduceat(self.counts, starts)}
+        )
         gap_margin = (bins.lb.to_numpy()[1:] - bins.ub.to_numpy()[:-1]) / 2
         cuts = (bins.lb.to_numpy()[1:] - gap_margin).tolist()
         bins.lb = [bins.lb.to_numpy()[0]] + cuts
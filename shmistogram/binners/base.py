@@ -0,0 +1,117 @@
+"""The binner protocol: the interface between a Shmistogram and its crowd-binning algorithm."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator, Protocol, runtime_checkable
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.names import COUNT, VALUE
+
+
+@dataclass(frozen=True)
+class BinnerCapabilities:
+    """Declared capabilities of a binner, used by callers to choose a data hand-off and execution strategy.
+
+    Attributes:
+        supports_weights: The binner accepts non-integer counts (i.e. observation weights), such as counts normalized
+            to sum to 1. Binners whose stopping rules count observations, like `min_data_in_leaf`, do not.
+        thread_safe: A single binner instance may be fit concurrently from multiple threads.
+    """
+
+    supports_weights: bool = False
+    thread_safe: bool = False
+
+
+@runtime_checkable
+class Binner(Protocol):
+    """A crowd-binning algorithm that consumes a tabulation as sorted arrays.
+
+    `fit_arrays` must return a DataFrame with one row per bin, in ascending order, with columns
+    'lb', 'ub', 'freq', 'width', and 'rate'. A binner may also define a `cache_key()` method returning a string that
+    identifies its settings, for binners that do not store each constructor argument under the same name (see
+    `shmistogram.fingerprint.binner_fingerprint`). A binner without a `capabilities` attribute is treated as declaring
+    the defaults.
+    """
+
+    capabilities: BinnerCapabilities
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Fit the binner to distinct `values` (sorted ascending) observed with the corresponding `counts`."""
+        ...
+
+
+class FrameBinnerAdapter:
+    """Adapt a legacy binner, which only has a `fit(df)` method, to the `Binner` protocol.
+
+    The legacy `fit` method receives a DataFrame indexed by the sorted distinct values with a single 'count' column.
+    """
+
+    capabilities = BinnerCapabilities()
+
+    def __init__(self, binner: Any) -> None:
+        """Wrap a binner that has a `fit(df)` method.
+
+        Args:
+            binner: An instance of a binning class with a fit() method.
+        """
+        if not callable(getattr(binner, "fit", None)):
+            raise TypeError(f"{type(binner).__name__} has neither a fit_arrays() nor a fit() method")
+        self.binner = binner
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Fit the wrapped binner by way of its DataFrame `fit` method."""
+        return self.binner.fit(counts_frame(values, counts))
+
+
+def counts_frame(values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+    """Build the legacy `fit(df)` input: a frame of counts indexed by the distinct values."""
+    return pd.DataFrame({COUNT: counts}, index=pd.Index(values, name=VALUE))
+
+
+def frame_arrays(df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Invert `counts_frame`: extract the (values, counts) arrays from a legacy `fit(df)` input."""
+    return df.index.to_numpy(), df[COUNT].to_numpy()
+
+
+def as_binner(binner: Any) -> Binner:
+    """Return `binner` itself if it has a `fit_arrays` method, else wrap it in a `FrameBinnerAdapter`."""
+    if callable(getattr(binner, "fit_arrays", None)):
+        return binner
+    return FrameBinnerAdapter(binner)
+
+
+def capabilities(binner: Any) -> BinnerCapabilities:
+    """The declared capabilities of any binner; binners that declare none, including legacy binners, get defaults."""
+    return getattr(as_binner(binner), "capabilities", BinnerCapabilities())
+
+
+class FitCancelled(Exception):
+    """Raised inside a binner's fit when the fit has been cancelled (see `cancel_on`)."""
+
+
+# The cancellation event of the fit running in the current context, if any
+_cancel_event: ContextVar[threading.Event | None] = ContextVar("shmistogram_cancel_event", default=None)
+
+
+@contextmanager
+def cancel_on(event: threading.Event) -> Iterator[None]:
+    """Make fits in this context cancellable: once `event` is set, the next `check_cancelled` raises FitCancelled."""
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
+
+def check_cancelled() -> None:
+    """Raise FitCancelled if the fit running in the current context has been cancelled.
+
+    Binners call this between iterations of their main loop (e.g. between node splits or bin merges).
+    """
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise FitCancelled()
@@ -1,23 +1,30 @@
 """Bayesian Blocks binning."""
 
+import os
 from typing import Any
 
 import numpy as np
 import pandas as pd
 from astropy import stats
 
-from shmistogram.names import COUNT, FREQ, LB, RATE, UB, WIDTH
+from shmistogram.binners.base import BinnerCapabilities, frame_arrays
+from shmistogram.binners.calibration import calibrated_ncp_prior
+from shmistogram.names import FREQ, LB, RATE, UB, WIDTH
 
 
 class BayesianBlocks:
     """Compute a Bayesian block representation."""
 
+    capabilities = BinnerCapabilities()
+
     def __init__(
         self,
         gamma: float = 0.015,
         sample_size: int | None = None,
         seed: int | None = None,
         kwargs: dict[str, Any] | None = None,
+        false_positive_rate: float | None = None,
+        calibration_dir: str | os.PathLike | None = None,
     ) -> None:
         """Initialize the BayesianBlocks object.
 
@@ -28,40 +35,63 @@ class BayesianBlocks:
             kwargs: Dictionary of additional keyword arguments to pass to astropy.stats.bayesian_blocks:
                 http://docs.astropy.org/en/stable/api/astropy.stats.bayesian_blocks.html
                 Feel free to pass any of these args excluding `t` and `x` (TODO explain why not those).
+            false_positive_rate: If not None, ignore `gamma` and instead set astropy's `ncp_prior` for the number of
+                events being fit, such that data with no change points is split with this probability. The priors
+                are calibrated by simulation once per process (see `shmistogram.binners.calibration`).
+            calibration_dir: A directory to store the simulated calibration in, for reuse across processes, or None.
         """
         self.gamma = gamma
         self.sample_size = sample_size
         self.seed = seed
         self.kwargs = kwargs or {}
+        self.false_positive_rate = false_positive_rate
+        self.calibration_dir = calibration_dir
+        if false_positive_rate is not None and "ncp_prior" in self.kwargs:
+            raise ValueError("Pass either false_positive_rate or an ncp_prior kwarg, not both")
+
+    def _bayesian_blocks(self, vals: np.ndarray) -> np.ndarray:
+        kwargs = self.kwargs
+        if self.false_positive_rate is not None:
+            ncp_prior = calibrated_ncp_prior(len(vals), self.false_positive_rate, self.calibration_dir)
+            kwargs = {**kwargs, "ncp_prior": ncp_prior}
+        return stats.bayesian_blocks(vals, gamma=self.gamma, **kwargs)
 
     def build_bin_edges(self, df):
         """Build bin edges using Bayesian Blocks."""
-        assert df.shape[0] > 1
-        vals = np.repeat(df.index.to_numpy(), df[COUNT].to_numpy())
+        return self.build_bin_edges_from_arrays(*frame_arrays(df))
+
+    def build_bin_edges_from_arrays(self, values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """Build bin edges using Bayesian Blocks, given sorted distinct values and their counts."""
+        assert values.shape[0] > 1
+        vals = np.repeat(values, counts)
         if self.sample_size is None:
-            bin_edges = stats.bayesian_blocks(vals, gamma=self.gamma, **self.kwargs)
+            bin_edges = self._bayesian_blocks(vals)
         else:
             if self.sample_size < 11:
                 raise ValueError("sample_size must be at least 11")
             if self.sample_size > len(vals):
-                bin_edges = stats.bayesian_blocks(vals, gamma=self.gamma, **self.kwargs)
+                bin_edges = self._bayesian_blocks(vals)
             else:
                 rng = np.random.default_rng(seed=self.seed)
                 svals = rng.choice(vals, size=self.sample_size, replace=False)
-                bin_edges = stats.bayesian_blocks(svals, gamma=self.gamma, **self.kwargs)
-                bin_edges[0] = df.index.min()
-                bin_edges[-1] = df.index.max()
+                bin_edges = self._bayesian_blocks(svals)
+                bin_edges[0] = values[0]
+                bin_edges[-1] = values[-1]
 
         # todo: update this temporary fix for https://github.com/astropy/astropy/issues/8558
         if len(bin_edges) == 1:
-            bin_edges = np.array([df.index.min(), df.index.max()])
+            bin_edges = np.array([values[0], values[-1]])
 
         self.counts_per_bin = np.histogram(vals, bins=bin_edges)[0]
         return bin_edges
 
     def fit(self, df):
         """Fit the Bayesian Blocks model to the data."""
-        bin_edges = self.build_bin_edges(df)
+        return self.fit_arrays(*frame_arrays(df))
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Fit the Bayesian Blocks model to sorted distinct values and their counts."""
+        bin_edges = self.build_bin_edges_from_arrays(values, counts)
         bins = pd.DataFrame({LB: bin_edges[:-1], UB: bin_edges[1:], FREQ: self.counts_per_bin})
         bins[WIDTH] = bins.ub - bins.lb
         bins[RATE] = bins.freq / bins.width
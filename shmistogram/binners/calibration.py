@@ -0,0 +1,108 @@
+"""Calibration of the Bayesian Blocks prior on the number of blocks to a target false-positive rate.
+
+With the 'events' fitness, astropy splits a block whenever doing so improves the fitness by more than `ncp_prior`. A
+false positive is a split of data that has no change points, i.e. of uniformly distributed events, so the
+`ncp_prior` that yields a false-positive rate p is the (1 - p) quantile, under uniform data, of the largest fitness
+gain of any one split. The fitness of a block of N_k events spanning width T_k is N_k * (log(N_k) - log(T_k)).
+
+The quantile depends smoothly on the number of events N, so it is simulated once on a log-spaced grid of N, smoothed,
+and interpolated in log(N). Tables are cached per process and, optionally, in a directory on disk.
+"""
+
+import functools
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from scipy.special import xlogy
+
+N_GRID = 2 ** np.arange(3, 17)
+N_SIMULATIONS = 1000
+SEED = 0
+# Bound the size of each (simulations x events) block of the simulation
+MAX_CHUNK_ELEMENTS = 2**22
+
+
+def _fitness(n: np.ndarray, width: np.ndarray) -> np.ndarray:
+    """The 'events' fitness of blocks with `n` events spanning `width`."""
+    return xlogy(n, n) - xlogy(n, width)
+
+
+def max_split_gain(n_events: int, n_simulations: int, rng: np.random.Generator) -> np.ndarray:
+    """For each of `n_simulations` sets of uniform events, the largest fitness gain of splitting them in two.
+
+    As in astropy, block edges are the first and last events and the midpoints between consecutive events.
+    """
+    gains = []
+    chunk = max(1, MAX_CHUNK_ELEMENTS // n_events)
+    for start in range(0, n_simulations, chunk):
+        t = np.sort(rng.random((min(chunk, n_simulations - start), n_events)), axis=1)
+        edges = np.concatenate([t[:, :1], (t[:, 1:] + t[:, :-1]) / 2, t[:, -1:]], axis=1)
+        k = np.arange(1, n_events)
+        left = _fitness(k, edges[:, 1:-1] - edges[:, :1])
+        right = _fitness(n_events - k, edges[:, -1:] - edges[:, 1:-1])
+        whole = _fitness(np.array(n_events), edges[:, -1] - edges[:, 0])
+        gains.append((left + right).max(axis=1) - whole)
+    return np.concatenate(gains)
+
+
+def build_ncp_prior_table(
+    false_positive_rate: float, n_simulations: int = N_SIMULATIONS, seed: int = SEED
+) -> np.ndarray:
+    """Simulate the calibrated `ncp_prior` at each number of events in N_GRID.
+
+    The simulated quantiles are smoothed by a least-squares fit on 1, log(N), and log(log(N)), which tracks them
+    closely (the largest gain of a scan over split points grows like log(log(N))) and removes the simulation noise.
+    """
+    if not 0 < false_positive_rate < 1:
+        raise ValueError("false_positive_rate must be between 0 and 1")
+    rng = np.random.default_rng(seed)
+    quantiles = [np.quantile(max_split_gain(int(n), n_simulations, rng), 1 - false_positive_rate) for n in N_GRID]
+    log_n = np.log(N_GRID)
+    design = np.column_stack([np.ones_like(log_n), log_n, np.log(log_n)])
+    coef = np.linalg.lstsq(design, np.array(quantiles), rcond=None)[0]
+    return design @ coef
+
+
+@functools.lru_cache
+def ncp_prior_table(false_positive_rate: float, cache_dir: str | None = None) -> np.ndarray:
+    """The calibrated `ncp_prior` at each number of events in N_GRID, built on first use.
+
+    Args:
+        false_positive_rate: The target probability of splitting data that has no change points
+        cache_dir: A directory in which to load and store tables across processes, or None
+    """
+    path = None if cache_dir is None else Path(cache_dir) / f"ncp_prior_{false_positive_rate!r}_{N_SIMULATIONS}.npy"
+    if path is not None and path.exists():
+        return np.load(path)
+    table = build_ncp_prior_table(false_positive_rate, N_SIMULATIONS)
+    if path is not None:
+        # Write to a temporary file first so that concurrent readers never see a partial table
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp, path)
+    return table
+
+
+def calibrated_ncp_prior(
+    n_events: int, false_positive_rate: float, cache_dir: str | os.PathLike | None = None
+) -> float:
+    """The `ncp_prior` for astropy's Bayesian Blocks that splits `n_events` uniform events at `false_positive_rate`.
+
+    Interpolates linearly in log(n_events) between the points of N_GRID, and extrapolates linearly beyond its end.
+
+    Args:
+        n_events: The number of events to be fit
+        false_positive_rate: The target probability of splitting data that has no change points
+        cache_dir: As in `ncp_prior_table`
+    """
+    table = ncp_prior_table(false_positive_rate, None if cache_dir is None else str(cache_dir))
+    log_n = np.log(N_GRID)
+    x = np.log(max(n_events, N_GRID[0]))
+    if x <= log_n[-1]:
+        return float(np.interp(x, log_n, table))
+    slope = (table[-1] - table[-2]) / (log_n[-1] - log_n[-2])
+    return float(table[-1] + slope * (x - log_n[-1]))
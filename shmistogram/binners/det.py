@@ -1,12 +1,14 @@
 """Density estimation tree (DET) for univariate data."""
 
 import warnings
+from typing import NamedTuple
 
 import numpy as np
 import pandas as pd
-from pandahandler import indexes
 
+from shmistogram.binners.base import BinnerCapabilities, check_cancelled, frame_arrays
 from shmistogram.names import COUNT, VALUE
+from shmistogram.validation import full_validation
 
 
 def isclose(a, b, rel_tol=1e-12, abs_tol=0.0):
@@ -82,7 +84,10 @@ def _search_split(df, lb=None, ub=None, min_data_in_leaf=None):
     df["neg_ll"] = df.left_neg_ll + df.right_neg_ll
     # null negative log likelihood
     nnll = -n_ob * np.log(null_dens)
-    assert nnll >= df.neg_ll.max() - 1e-12
+    if full_validation():
+        # The best split can tie the null model; allow for rounding, which grows with the magnitude of the likelihood
+        max_neg_ll = df.neg_ll.max()
+        assert nnll >= max_neg_ll or isclose(nnll, max_neg_ll)
     n_min = df[["left_n", "right_n"]].min(axis=1)
     adj_neg_ll = df.neg_ll * (1 + 0.05 * np.exp(-n_min / 10))
     idx = adj_neg_ll.idxmin()
@@ -103,28 +108,36 @@ def _search_split(df, lb=None, ub=None, min_data_in_leaf=None):
     return ret
 
 
+class Bound(NamedTuple):
+    """A node boundary: the position of the boundary in the sorted data, and its value."""
+
+    idx: int
+    value: float
+
+
 class Node:
     """Node in a binary tree for density estimation."""
 
-    def __init__(self, lb, ub):
+    __slots__ = ("lb", "ub", "left", "right")
+
+    def __init__(self, lb: Bound, ub: Bound):
         """Initialize the node.
 
-        :param lb: (dict) of form {'idx': <int>, 'value': <float>}
-        :param ub: (dict) of form {'idx': <int>, 'value': <float>}
-        #:param neighbors: (dict) of form {'left': <Node>, 'right', <Node>
+        Args:
+            lb: The lower boundary of the node
+            ub: The upper boundary of the node
         """
         self.lb = lb
         self.ub = ub
-        assert isinstance(lb["idx"], int)
-        assert isinstance(ub["idx"], int)
         # Children
-        self.left = None
-        self.right = None
+        self.left: Node | None = None
+        self.right: Node | None = None
 
-    def split(self, threshold):
+    def split(self, threshold: Bound):
         """Split the node into two children.
 
-        :param threshold: (dict) of form {'idx': <int>, 'value': <float>}
+        Args:
+            threshold: The boundary between the children
         """
         self.left = Node(lb=self.lb, ub=threshold)
         self.right = Node(lb=threshold, ub=self.ub)
@@ -133,12 +146,15 @@ class Node:
 class DensityEstimationTree:
     """Univariate density estimation with a binary tree."""
 
+    capabilities = BinnerCapabilities()
+
     def __init__(
         self,
         n_bins: int | None = None,
         max_bins: int | None = None,
         min_data_in_leaf: int = 3,
         lambda_: float = 1.0,
+        release_data: bool = False,
     ) -> None:
         """Initialize the DensityEstimationTree.
 
@@ -147,11 +163,13 @@ class DensityEstimationTree:
             max_bins: The maximum number of bins to use in the density estimation.
             min_data_in_leaf: The minimum number of data points in each leaf node.
             lambda_: Threshold on the information gain required to justify a node split.
+            release_data: Whether to drop the training data and the tree after each fit (see `drop_training_data`).
         """
         self.n_bins = n_bins
         self.max_bins = max_bins
         self.min_data_in_leaf = min_data_in_leaf or 1
         self.lambda_ = lambda_
+        self.release_data = release_data
         if n_bins is not None and max_bins is not None:
             if max_bins < n_bins:
                 raise ValueError("You must not specify max_bins less than n_bins")
@@ -159,14 +177,14 @@ class DensityEstimationTree:
             if not isinstance(min_data_in_leaf, int) or min_data_in_leaf < 1:
                 raise ValueError("min_data_in_leaf must be an integer >= 1 or None")
 
-    def _accept_data(self, df: pd.DataFrame) -> None:
-        df.index.name = VALUE
-        self.df = indexes.unset(df)
+    def _accept_data(self, values: np.ndarray, counts: np.ndarray) -> None:
+        # Widen to float, since the split search subtracts values, which overflows narrow integer dtypes
+        self.df = pd.DataFrame({VALUE: values.astype(float), COUNT: counts})
 
     def _plant_the_tree(self):
         self.root = Node(
-            lb={"idx": int(0), VALUE: self.df[VALUE].iloc[0]},
-            ub={"idx": int(self.df.shape[0]), VALUE: self.df[VALUE].iloc[-1]},
+            lb=Bound(0, self.df[VALUE].iloc[0]),
+            ub=Bound(self.df.shape[0], self.df[VALUE].iloc[-1]),
         )
         self.last_node_idx = 0
         self.nodes = {self.last_node_idx: self.root}
@@ -201,7 +219,7 @@ class DensityEstimationTree:
                 except Exception as err:
                     raise Exception("Terminated for unknown reason") from err
             return False
-        self.threshold = {"idx": int(idx), VALUE: val}
+        self.threshold = Bound(int(idx), val)
         _node_int = self.leaves.index[-1]
         assert isinstance(_node_int, (int, np.integer)), "best_node_idx is not an integer"
         self.best_node = int(_node_int)
@@ -222,9 +240,9 @@ class DensityEstimationTree:
 
     def _search_split(self, node):
         mdil = self.min_data_in_leaf
-        df = self.df.iloc[node.lb["idx"] : node.ub["idx"]].copy()
+        df = self.df.iloc[node.lb.idx : node.ub.idx].copy()
         if df.shape[0] > 1:
-            return _search_split(df, lb=node.lb[VALUE], ub=node.ub[VALUE], min_data_in_leaf=mdil)
+            return _search_split(df, lb=node.lb.value, ub=node.ub.value, min_data_in_leaf=mdil)
         else:
             return {
                 "deviance_improvement": -1,  # negative improvment ensures no more splits
@@ -235,6 +253,7 @@ class DensityEstimationTree:
 
     def _grow_the_tree(self):
         while self._continue_splitting():
+            check_cancelled()
             node = self.nodes[self.best_node]
             node.split(self.threshold)
             nl = node.left
@@ -247,26 +266,45 @@ class DensityEstimationTree:
             # precompute the new leaves' best split points
             snl = self._search_split(nl)
             snr = self._search_split(nr)
-            indexes = set(self.leaves.idx)
-            if snr["idx"] is not None and snr["idx"] > 0:
-                assert snr["idx"] not in indexes
-            if snl["idx"] is not None and snl["idx"] > 0:
-                assert snl["idx"] not in indexes
+            if full_validation():
+                indexes = set(self.leaves.idx)
+                if snr["idx"] is not None and snr["idx"] > 0:
+                    assert snr["idx"] not in indexes
+                if snl["idx"] is not None and snl["idx"] > 0:
+                    assert snl["idx"] not in indexes
             # drop the chosen leaf and replace it with its children
             self.leaves = self.leaves.drop([self.best_node], axis=0)
             self.leaves.loc[i + 1] = snl  # pyright: ignore
             self.leaves.loc[i + 2] = snr  # pyright: ignore
-            assert self.leaves.n.sum() == self.N
+            if full_validation():
+                assert self.leaves.n.sum() == self.N
             self.last_node_idx += 2
 
-    def fit(self, df: pd.DataFrame):
-        """Fit the DensityEstimationTree to the data."""
-        self.N = df[COUNT].sum()
+    def fit(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Fit the DensityEstimationTree to a DataFrame of counts indexed by the sorted distinct values."""
+        return self.fit_arrays(*frame_arrays(df))
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Fit the DensityEstimationTree to sorted distinct values and their counts."""
+        self.N = counts.sum()
         if self.N > 0:
-            self._accept_data(df)
+            self._accept_data(values, counts)
             self._plant_the_tree()
             self._grow_the_tree()
-        return self._bins()
+        bins = self._bins()
+        self.edges = np.append(bins.lb.to_numpy()[:1], bins.ub.to_numpy())
+        self.freqs = bins.freq.to_numpy()
+        if self.release_data:
+            self.drop_training_data()
+        return bins
+
+    def drop_training_data(self) -> None:
+        """Drop the training data and the tree, keeping only the fitted bin `edges` and `freqs`.
+
+        A fitted tree otherwise holds the full crowd tabulation, so this matters when many fits are kept alive.
+        """
+        for name in ["df", "root", "nodes", "leaves", "threshold", "best_node"]:
+            self.__dict__.pop(name, None)
 
     def _bins(self) -> pd.DataFrame:
         """Identify all leaf bins in ascending order."""
@@ -274,7 +312,7 @@ class DensityEstimationTree:
             return pd.DataFrame({"lb": [], "ub": [], "freq": [], "width": [], "rate": []})
         lnodes = self.leaves.index.to_numpy()
         df = pd.DataFrame(
-            {"lb": [self.nodes[k].lb[VALUE] for k in lnodes], "ub": [self.nodes[k].ub[VALUE] for k in lnodes]}
+            {"lb": [self.nodes[k].lb.value for k in lnodes], "ub": [self.nodes[k].ub.value for k in lnodes]}
         )
         df["freq"] = self.leaves.n.to_numpy()
         assert (df.ub - df.lb).min() > 0
@@ -0,0 +1,194 @@
+"""Density estimation tree (DET) for bivariate data.
+
+The tree recursively splits axis-aligned boxes. Each candidate split of a box is scored with the same penalized
+deviance criterion as the univariate `shmistogram.binners.det._search_split`, and the best split over both axes wins.
+The data is sorted once along each axis. The points of every leaf occupy the same contiguous slice of both sorted
+permutations, which are stably partitioned when the leaf splits, so scoring all candidate splits of a leaf along an axis
+takes a single prefix sum of the counts and no further sorting.
+"""
+
+import heapq
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.binners.base import BinnerCapabilities, check_cancelled
+from shmistogram.names import AREA, FREQ, RATE, X_LB, X_UB, Y_LB, Y_UB
+
+_NO_SPLIT = {"deviance_improvement": -1.0}
+
+
+def _search_split_2d(
+    values: tuple[np.ndarray, np.ndarray],
+    counts: tuple[np.ndarray, np.ndarray],
+    bounds: np.ndarray,
+    min_data_in_leaf: int,
+) -> dict:
+    """Search for the optimal split of a box over both axes.
+
+    Args:
+        values: For each axis, the coordinates on that axis of the distinct points in the box, sorted ascending
+        counts: For each axis, the number of observations of each point, in the same order as `values`
+        bounds: (2, 2) array of the box's [lower, upper] bounds on each axis
+        min_data_in_leaf: The minimum number of data points in each leaf node
+
+    Returns:
+        A dictionary with keys 'deviance_improvement', 'axis', 'threshold', and 'n_left', where the left child holds
+        the first `n_left` points in sorted order along `axis`
+    """
+    n = counts[0].sum()
+    widths = bounds[:, 1] - bounds[:, 0]
+    nnll = n * np.log(widths.prod())  # null negative log likelihood: uniform density over the box
+    best = _NO_SPLIT
+    for axis in (0, 1):
+        value = values[axis]
+        left_n = np.cumsum(counts[axis])[:-1]
+        right_n = n - left_n
+        # Only split between distinct coordinates, leaving at least min_data_in_leaf on each side
+        ok = (value[:-1] < value[1:]) & (left_n >= min_data_in_leaf) & (right_n >= min_data_in_leaf)
+        if not ok.any():
+            continue
+        threshold = (value[:-1] + value[1:]) / 2
+        left_area = (threshold - bounds[axis, 0]) * widths[1 - axis]
+        right_area = (bounds[axis, 1] - threshold) * widths[1 - axis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            neg_ll = -left_n * np.log(left_n / (n * left_area)) - right_n * np.log(right_n / (n * right_area))
+        n_min = np.minimum(left_n, right_n)
+        adj_neg_ll = np.where(ok, neg_ll * (1 + 0.05 * np.exp(-n_min / 10)), np.inf)
+        idx = int(np.argmin(adj_neg_ll))
+        di = nnll - adj_neg_ll[idx]
+        if di > best["deviance_improvement"]:
+            best = {"deviance_improvement": di, "axis": axis, "threshold": threshold[idx], "n_left": idx + 1}
+    return best
+
+
+class DensityEstimationTree2D:
+    """Bivariate density estimation with a binary tree of axis-aligned splits."""
+
+    capabilities = BinnerCapabilities()
+
+    def __init__(
+        self,
+        n_bins: int | None = None,
+        max_bins: int | None = None,
+        min_data_in_leaf: int = 3,
+        lambda_: float = 1.0,
+        release_data: bool = False,
+    ) -> None:
+        """Initialize the DensityEstimationTree2D.
+
+        Args:
+            n_bins: The number of bins to use in the density estimation.
+            max_bins: The maximum number of bins to use in the density estimation.
+            min_data_in_leaf: The minimum number of data points in each leaf node.
+            lambda_: Threshold on the information gain required to justify a node split.
+            release_data: Whether to drop the training data after each fit (see `drop_training_data`).
+        """
+        self.n_bins = n_bins
+        self.max_bins = max_bins
+        self.min_data_in_leaf = min_data_in_leaf
+        self.lambda_ = lambda_
+        self.release_data = release_data
+        if n_bins is not None and max_bins is not None:
+            if max_bins < n_bins:
+                raise ValueError("You must not specify max_bins less than n_bins")
+        if not isinstance(min_data_in_leaf, int) or min_data_in_leaf < 1:
+            raise ValueError("min_data_in_leaf must be an integer >= 1")
+
+    def _root_bounds(self, xy: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """The bounding box of the data, padded as the univariate DET pads the range of the data."""
+        lo = xy.min(axis=0)
+        hi = xy.max(axis=0)
+        rg = hi - lo
+        margin = np.where(rg > 0, rg / counts.sum(), 0.5)
+        return np.column_stack([lo - margin, hi + margin])
+
+    def _search(self, start: int, stop: int, bounds: np.ndarray) -> dict:
+        idx = self.perm[:, start:stop]
+        values = (self.xy[idx[0], 0], self.xy[idx[1], 1])
+        counts = (self.counts[idx[0]], self.counts[idx[1]])
+        return _search_split_2d(values, counts, bounds, self.min_data_in_leaf)
+
+    def _partition(self, start: int, stop: int, axis: int, mid: int) -> None:
+        """Stably partition the other axis' permutation of a leaf to match a split of `axis` at position `mid`."""
+        other = 1 - axis
+        self.is_left[self.perm[axis, start:mid]] = True
+        idx = self.perm[other, start:stop]
+        goes_left = self.is_left[idx]
+        self.perm[other, start:stop] = np.concatenate([idx[goes_left], idx[~goes_left]])
+        self.is_left[self.perm[axis, start:mid]] = False
+
+    def _continue_splitting(self, n_leaves: int, best_improvement: float) -> bool:
+        if best_improvement < 0:
+            if self.n_bins is not None and n_leaves < self.n_bins:
+                msg = f"min_data_in_leaf is {self.min_data_in_leaf}, which limits the number of bins to {n_leaves}"
+                warnings.warn(msg)
+            return False
+        if self.n_bins is not None:
+            return n_leaves < self.n_bins
+        if self.max_bins and n_leaves >= self.max_bins:
+            return False
+        return best_improvement > self.lambda_ * n_leaves
+
+    def fit_arrays(self, values: np.ndarray, counts: np.ndarray) -> pd.DataFrame:
+        """Fit the tree to distinct points and their counts.
+
+        Args:
+            values: (m, 2) array of distinct (x, y) points
+            counts: Number of observations of each point
+
+        Returns:
+            A DataFrame with one row per leaf box and columns 'x_lb', 'x_ub', 'y_lb', 'y_ub', 'freq', 'area', 'rate'
+        """
+        self.xy = np.asarray(values, dtype=float)
+        self.counts = np.asarray(counts)
+        self.N = self.counts.sum()
+        self.perm = np.stack([np.argsort(self.xy[:, axis], kind="stable") for axis in (0, 1)])
+        self.is_left = np.zeros(self.xy.shape[0], dtype=bool)
+        leaves = []
+        if self.xy.shape[0] > 0:
+            # Max-heap of leaves by deviance improvement; the counter breaks ties without comparing dicts
+            bounds = self._root_bounds(self.xy, self.counts)
+            split = self._search(0, self.xy.shape[0], bounds)
+            heap = [(-split["deviance_improvement"], 0, 0, self.xy.shape[0], bounds, split)]
+            counter = 1
+            while self._continue_splitting(len(heap), -heap[0][0]):
+                check_cancelled()
+                _, _, start, stop, bounds, split = heapq.heappop(heap)
+                mid = start + split["n_left"]
+                axis = split["axis"]
+                self._partition(start, stop, axis, mid)
+                left_bounds = bounds.copy()
+                left_bounds[axis, 1] = split["threshold"]
+                right_bounds = bounds.copy()
+                right_bounds[axis, 0] = split["threshold"]
+                for child in [(start, mid, left_bounds), (mid, stop, right_bounds)]:
+                    child_split = self._search(*child)
+                    heapq.heappush(heap, (-child_split["deviance_improvement"], counter, *child, child_split))
+                    counter += 1
+            leaves = [(start, stop, bounds) for _, _, start, stop, bounds, _ in heap]
+        self.bins = self._bins(leaves)
+        if self.release_data:
+            self.drop_training_data()
+        return self.bins
+
+    def drop_training_data(self) -> None:
+        """Drop the training points and their sort orders, keeping only the fitted bins."""
+        for name in ["xy", "counts", "perm", "is_left"]:
+            self.__dict__.pop(name, None)
+
+    def _bins(self, leaves: list[tuple[int, int, np.ndarray]]) -> pd.DataFrame:
+        bounds = np.array([b for _, _, b in leaves]).reshape(-1, 2, 2)
+        df = pd.DataFrame(
+            {
+                X_LB: bounds[:, 0, 0],
+                X_UB: bounds[:, 0, 1],
+                Y_LB: bounds[:, 1, 0],
+                Y_UB: bounds[:, 1, 1],
+                FREQ: [self.counts[self.perm[0, start:stop]].sum() for start, stop, _ in leaves],
+            }
+        )
+        df[AREA] = (df[X_UB] - df[X_LB]) * (df[Y_UB] - df[Y_LB])
+        df[RATE] = df[FREQ] / df[AREA]
+        return df.sort_values([X_LB, Y_LB]).reset_index(drop=True)
@@ -0,0 +1,126 @@
+"""Bootstrap confidence bands for the bin rates and loner/crowd shares of a fitted Shmistogram.
+
+Each replicate is a multinomial draw of `n_obs` observations from the tabulation of distinct values, so the cost of a
+replicate does not depend on the number of raw observations. Values keep their loner/crowd assignment; the binner is
+refit to the resampled crowd, and the replicate's piecewise-uniform crowd density is integrated over the original
+bin edges so that all replicates share one set of bins.
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.binners.base import as_binner
+from shmistogram.names import LB, RATE, UB
+from shmistogram.shmistogram import Shmistogram
+
+CHUNKS_PER_WORKER = 4
+
+
+@dataclass
+class BootstrapBands:
+    """Bootstrap quantiles of a Shmistogram fit.
+
+    Attributes:
+        bins: The original bins ('lb', 'ub', 'rate') with one column of rate quantiles per requested quantile
+        loner_crowd_shares: Quantiles (rows) of the loner and crowd shares (columns)
+        rates: The (n_replicates, n_bins) array of replicate rates on the original bin edges
+        shares: The (n_replicates, 2) array of replicate loner and crowd shares
+    """
+
+    bins: pd.DataFrame
+    loner_crowd_shares: pd.DataFrame
+    rates: np.ndarray
+    shares: np.ndarray
+
+
+def _rates_on_edges(bins: pd.DataFrame, edges: np.ndarray) -> np.ndarray:
+    """Integrate the piecewise-uniform density of `bins` over the intervals between `edges`."""
+    x = np.concatenate([bins[LB].to_numpy()[:1], bins[UB].to_numpy()])
+    cumulative = np.concatenate([[0.0], np.cumsum(bins["freq"].to_numpy())])
+    # The cumulative count is piecewise linear between bin edges, so linear interpolation is exact
+    return np.diff(np.interp(edges, x, cumulative)) / np.diff(edges)
+
+
+def _replicates(
+    binner: Any,
+    loner_counts: np.ndarray,
+    crowd_values: np.ndarray,
+    crowd_counts: np.ndarray,
+    edges: np.ndarray,
+    seeds: Sequence[np.random.SeedSequence],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Compute the rates and loner/crowd shares of one replicate per seed."""
+    binner = as_binner(binner)
+    counts = np.concatenate([loner_counts, crowd_counts])
+    n_obs = counts.sum()
+    n_loner_values = loner_counts.shape[0]
+    rates = np.zeros((len(seeds), max(edges.shape[0] - 1, 0)))
+    shares = np.zeros((len(seeds), 2))
+    for i, seed in enumerate(seeds):
+        draw = np.random.default_rng(seed).multinomial(n_obs, counts / n_obs)
+        crowd = draw[n_loner_values:]
+        shares[i] = [draw[:n_loner_values].sum(), crowd.sum()]
+        observed = crowd > 0
+        if rates.shape[1] and observed.sum() > 1:
+            bins = binner.fit_arrays(crowd_values[observed], crowd[observed])
+            rates[i] = _rates_on_edges(bins, edges)
+    return rates, shares / n_obs
+
+
+def bootstrap_bands(
+    shm: Shmistogram,
+    n_replicates: int = 200,
+    quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+    seed: int | None = None,
+    max_workers: int | None = None,
+) -> BootstrapBands:
+    """Estimate bootstrap quantile bands for the bin rates and the loner/crowd shares of a fitted Shmistogram.
+
+    Replicate `i` always draws from the `i`th child of `np.random.SeedSequence(seed)`, so results for a given seed are
+    reproducible regardless of `max_workers`.
+
+    Args:
+        shm: A fitted Shmistogram
+        n_replicates: The number of bootstrap replicates
+        quantiles: The quantiles to report
+        seed: Seed for the random number generator
+        max_workers: The number of worker processes; None means one per CPU and 1 means run in this process
+    """
+    seeds = np.random.SeedSequence(seed).spawn(n_replicates)
+    bins = shm.bins if shm.bins is not None else pd.DataFrame({LB: [], UB: [], RATE: []})
+    edges = np.concatenate([bins[LB].to_numpy()[:1], bins[UB].to_numpy()])
+    crowd = shm.crowd.counts
+    args = (
+        copy.deepcopy(shm.binner),
+        shm.loners.counts.to_numpy(),
+        crowd.index.to_numpy(),
+        crowd.to_numpy(),
+        edges,
+    )
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        rates, shares = _replicates(*args, seeds)
+    else:
+        n_chunks = min(n_replicates, max_workers * CHUNKS_PER_WORKER)
+        chunks = [seeds[idxs[0] : idxs[-1] + 1] for idxs in np.array_split(np.arange(n_replicates), n_chunks)]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_replicates, *zip(*[args + (chunk,) for chunk in chunks])))
+        rates = np.concatenate([r for r, _ in results])
+        shares = np.concatenate([s for _, s in results])
+
+    bands = bins[[LB, UB, RATE]].copy()
+    assert isinstance(bands, pd.DataFrame), "Expected bins to be a DataFrame"
+    for q in quantiles:
+        bands[f"{RATE}_q{q:g}"] = np.quantile(rates, q, axis=0) if bins.shape[0] else []
+    share_bands = pd.DataFrame(
+        np.quantile(shares, list(quantiles), axis=0),
+        index=pd.Index(quantiles, name="quantile"),
+        columns=["loner", "crowd"],
+    )
+    return BootstrapBands(bins=bands, loner_crowd_shares=share_bands, rates=rates, shares=shares)
@@ -0,0 +1,124 @@
+"""Cache fitted shmistograms, keyed by the content of the data and the fit settings."""
+
+import os
+import pickle
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Hashable, Literal, Sequence
+
+import numpy as np
+
+from shmistogram.fingerprint import fit_key
+from shmistogram.shmistogram import Shmistogram
+
+
+class ShmistogramCache:
+    """An in-memory LRU cache of fitted shmistograms, optionally backed by an on-disk store.
+
+    Cached shmistograms are shared between all callers that request the same fit, so treat them as read-only.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: str | os.PathLike | None = None) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_bytes: The in-memory store evicts least-recently-used fits once their total pickled size exceeds
+                this many bytes
+            directory: A directory for the on-disk store, or None to cache in memory only
+        """
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[Shmistogram, int]] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of fits held in memory."""
+        return len(self._entries)
+
+    @property
+    def nbytes(self) -> int:
+        """The total pickled size of the fits held in memory."""
+        return self._nbytes
+
+    def get_or_fit(
+        self,
+        data: Sequence[Hashable] | np.ndarray,
+        *,
+        binner: Any | None = None,
+        loner_min_count: int | Literal["auto"] | None = None,
+    ) -> Shmistogram:
+        """Return the cached Shmistogram for this data and these settings, fitting it first on a cache miss.
+
+        A binner whose settings cannot be fingerprinted (see `shmistogram.fingerprint.binner_fingerprint`) is fit
+        without caching, with a warning.
+
+        Args:
+            data: series-like object (pandas.Series, numpy 1-d array, flat list)
+            binner: As in `Shmistogram`
+            loner_min_count: As in `Shmistogram`
+        """
+        key = fit_key(data, binner=binner, loner_min_count=loner_min_count)
+        if key is None:
+            warnings.warn(f"Not caching the fit: the settings of {type(binner).__name__} cannot be fingerprinted")
+            return Shmistogram(data, binner=binner, loner_min_count=loner_min_count)
+        shm = self._get(key)
+        if shm is not None:
+            return shm
+        shm = Shmistogram(data, binner=binner, loner_min_count=loner_min_count)
+        self._put(key, shm, pickle.dumps(shm, protocol=pickle.HIGHEST_PROTOCOL))
+        return shm
+
+    def clear(self) -> None:
+        """Drop all fits from memory; the on-disk store, if any, is left intact."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{key}.pkl"
+
+    def _get(self, key: str) -> Shmistogram | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        if self.directory is not None and self._path(key).exists():
+            payload = self._path(key).read_bytes()
+            shm = pickle.loads(payload)
+            self._remember(key, shm, len(payload))
+            with self._lock:
+                self.hits += 1
+            return shm
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put(self, key: str, shm: Shmistogram, payload: bytes) -> None:
+        self._remember(key, shm, len(payload))
+        if self.directory is not None:
+            # Write to a temporary file first so that concurrent readers never see a partial pickle
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp, self._path(key))
+
+    def _remember(self, key: str, shm: Shmistogram, nbytes: int) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (shm, nbytes)
+            self._nbytes += nbytes
+            while self._nbytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._nbytes -= evicted
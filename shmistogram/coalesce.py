@@ -0,0 +1,92 @@
+"""Run blocking fits off the asyncio event loop, cancellably, sharing one fit among identical concurrent requests.
+
+Each fit runs in an executor under its own `threading.Event`, installed with `shmistogram.binners.base.cancel_on`, so
+binners stop at their next `check_cancelled`. Concurrent requests with the same key await one shielded fit; the fit
+is cancelled only once every request waiting on it has been cancelled.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, TypeVar
+
+from shmistogram.binners.base import cancel_on
+
+T = TypeVar("T")
+
+
+@dataclass
+class _InFlight:
+    """A running fit and the number of requests waiting on it."""
+
+    future: asyncio.Future
+    cancel: threading.Event = field(default_factory=threading.Event)
+    waiters: int = 0
+
+
+# In-flight fits by key, per event loop, since a future belongs to the loop that created it
+_in_flight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _InFlight]]" = weakref.WeakKeyDictionary()
+
+
+def _run_cancellable(cancel: threading.Event, func: Callable[[], T]) -> T:
+    with cancel_on(cancel):
+        return func()
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    # A fit whose waiters were all cancelled ends in FitCancelled with no one left to see it
+    if not future.cancelled():
+        future.exception()
+
+
+def _start(func: Callable[[], T], executor: Executor | None) -> _InFlight:
+    loop = asyncio.get_running_loop()
+    if isinstance(executor, ProcessPoolExecutor):
+        # Neither the context nor the event can cross the process boundary, so the fit runs to completion
+        future = loop.run_in_executor(executor, func)
+        in_flight = _InFlight(future)
+    else:
+        cancel = threading.Event()
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(executor, context.run, functools.partial(_run_cancellable, cancel, func))
+        in_flight = _InFlight(future, cancel)
+    future.add_done_callback(_retrieve_exception)
+    return in_flight
+
+
+async def coalesce(key: str | None, func: Callable[[], T], executor: Executor | None = None) -> T:
+    """Await func() run in `executor`, or await the identical call already in flight.
+
+    Args:
+        key: Identifies the result of func(); concurrent calls with equal keys share a single call of func. None means
+            never share.
+        func: A blocking callable. With a process pool executor it must be picklable, and it cannot be cancelled.
+        executor: The executor to run func in, or None for the event loop's default executor
+
+    Raises:
+        asyncio.CancelledError: If the awaiting task is cancelled. The call of func is cancelled too, by way of
+            `check_cancelled`, unless other tasks are still waiting on it.
+    """
+    fits = _in_flight.setdefault(asyncio.get_running_loop(), {})
+    in_flight = fits.get(key) if key is not None else None
+    if in_flight is None:
+        in_flight = _start(func, executor)
+        if key is not None:
+            fits[key] = in_flight
+            in_flight.future.add_done_callback(lambda _: fits.pop(key, None) if fits.get(key) is in_flight else None)
+    in_flight.waiters += 1
+    try:
+        return await asyncio.shield(in_flight.future)
+    except asyncio.CancelledError:
+        if in_flight.waiters == 1 and not in_flight.future.done():
+            in_flight.cancel.set()
+            # Later requests for this key start a fresh fit rather than join the cancelled one
+            if key is not None and fits.get(key) is in_flight:
+                del fits[key]
+        raise
+    finally:
+        in_flight.waiters -= 1
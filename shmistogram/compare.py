@@ -0,0 +1,202 @@
+"""Distances between fitted shmistograms, computed exactly on their mixture representation.
+
+A fitted Shmistogram is a probability measure with three mutually singular parts: a piecewise-uniform crowd density,
+point masses at the loners, and a point mass on null. Every metric here is computed directly on those parts by
+merging the two sorted sets of bin edges and loner values, with no sampling or gridding. Merging uses a stable sort,
+which detects and merges the two presorted runs in linear time, and lookups into each model are binary searches, so
+each comparison costs O((k1 + k2) log(k1 + k2)) for k1 and k2 bins plus loners.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import numpy as np
+
+from shmistogram.names import FREQ, LB, UB
+from shmistogram.shmistogram import Shmistogram
+
+
+@dataclass(frozen=True)
+class MixtureMeasure:
+    """The probability measure of a fitted Shmistogram, as arrays.
+
+    Attributes:
+        edges: The (k + 1) crowd bin edges, ascending
+        bin_mass: The probability mass of each of the k crowd bins
+        atoms: The non-null loner values, ascending
+        atom_mass: The probability mass of each loner value
+        null_mass: The probability mass of null values
+    """
+
+    edges: np.ndarray
+    bin_mass: np.ndarray
+    atoms: np.ndarray
+    atom_mass: np.ndarray
+    null_mass: float
+
+    @classmethod
+    def from_shmistogram(cls, shm: Shmistogram) -> "MixtureMeasure":
+        """The probability measure of a fitted Shmistogram."""
+        if shm.bins is None or shm.bins.shape[0] == 0:
+            edges, bin_mass = np.array([]), np.array([])
+        else:
+            edges = np.append(shm.bins[LB].to_numpy()[:1], shm.bins[UB].to_numpy()).astype(float)
+            bin_mass = shm.bins[FREQ].to_numpy() / shm.n_obs
+        loners = shm.loners.counts
+        values = loners.index.to_numpy(dtype=float)
+        isnull = np.isnan(values)
+        atom_mass = loners.to_numpy() / shm.n_obs
+        return cls(
+            edges=edges,
+            bin_mass=bin_mass,
+            atoms=values[~isnull],
+            atom_mass=atom_mass[~isnull],
+            null_mass=float(atom_mass[isnull].sum()),
+        )
+
+    def density(self, x: np.ndarray) -> np.ndarray:
+        """The crowd density at each x (zero outside the bins; bins are closed on the left)."""
+        if self.bin_mass.shape[0] == 0:
+            return np.zeros_like(x, dtype=float)
+        idx = np.searchsorted(self.edges, x, side="right") - 1
+        inside = (idx >= 0) & (idx < self.bin_mass.shape[0])
+        idx = np.clip(idx, 0, self.bin_mass.shape[0] - 1)
+        return np.where(inside, self.bin_mass[idx] / np.diff(self.edges)[idx], 0.0)
+
+    def cdf(self, x: np.ndarray, side: str = "right") -> np.ndarray:
+        """The non-null CDF at each x; side='left' gives the left limit, which excludes any atom at x."""
+        crowd = np.interp(x, self.edges, np.append(0.0, np.cumsum(self.bin_mass))) if self.edges.shape[0] else 0.0
+        loners = np.append(0.0, np.cumsum(self.atom_mass))[np.searchsorted(self.atoms, x, side=side)]  # pyright: ignore
+        return crowd + loners
+
+
+Comparable = Shmistogram | MixtureMeasure
+
+
+def _measure(shm: Comparable) -> MixtureMeasure:
+    return shm if isinstance(shm, MixtureMeasure) else MixtureMeasure.from_shmistogram(shm)
+
+
+def _merge(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """The sorted union of two sorted arrays."""
+    merged = np.sort(np.concatenate([a, b]), kind="stable")
+    return merged[np.concatenate([[True], merged[1:] != merged[:-1]])] if merged.shape[0] else merged
+
+
+def _atom_masses(p: MixtureMeasure, q: MixtureMeasure) -> tuple[np.ndarray, np.ndarray]:
+    """The masses of p and q at the union of their atoms, with null as one more atom."""
+    atoms = _merge(p.atoms, q.atoms)
+
+    def at(m: MixtureMeasure) -> np.ndarray:
+        mass = np.zeros(atoms.shape[0] + 1)
+        mass[np.searchsorted(atoms, m.atoms)] = m.atom_mass
+        mass[-1] = m.null_mass
+        return mass
+
+    return at(p), at(q)
+
+
+def _segments(p: MixtureMeasure, q: MixtureMeasure) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Widths of the intervals between the merged bin edges, and the (constant) densities of p and q on each."""
+    edges = _merge(p.edges, q.edges)
+    if edges.shape[0] < 2:
+        return np.array([]), np.array([]), np.array([])
+    mids = (edges[:-1] + edges[1:]) / 2
+    return np.diff(edges), p.density(mids), q.density(mids)
+
+
+def _xlogy_ratio(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Elementwise x * log(x / y), with 0 * log(0 / y) = 0."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(x > 0, x * np.log(x / y), 0.0)
+
+
+def total_variation(p: Comparable, q: Comparable) -> float:
+    """Total variation distance: the largest difference in the probability that p and q assign to any event."""
+    p, q = _measure(p), _measure(q)
+    pa, qa = _atom_masses(p, q)
+    width, pd_, qd = _segments(p, q)
+    return 0.5 * float(np.abs(pa - qa).sum() + (np.abs(pd_ - qd) * width).sum())
+
+
+def kl_divergence(p: Comparable, q: Comparable) -> float:
+    """Kullback-Leibler divergence KL(p || q), in nats; infinite unless q is positive wherever p is."""
+    p, q = _measure(p), _measure(q)
+    pa, qa = _atom_masses(p, q)
+    width, pd_, qd = _segments(p, q)
+    return float(_xlogy_ratio(pa, qa).sum() + (_xlogy_ratio(pd_, qd) * width).sum())
+
+
+def js_divergence(p: Comparable, q: Comparable) -> float:
+    """Jensen-Shannon divergence, in nats (between 0 and log(2))."""
+    p, q = _measure(p), _measure(q)
+    pa, qa = _atom_masses(p, q)
+    width, pd_, qd = _segments(p, q)
+    ma, md = (pa + qa) / 2, (pd_ + qd) / 2
+    atoms = _xlogy_ratio(pa, ma) + _xlogy_ratio(qa, ma)
+    crowd = (_xlogy_ratio(pd_, md) + _xlogy_ratio(qd, md)) * width
+    return 0.5 * float(atoms.sum() + crowd.sum())
+
+
+def _cdf_differences(p: MixtureMeasure, q: MixtureMeasure) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Differences between the normalized non-null CDFs of p and q at the left and right limits of each breakpoint.
+
+    Both CDFs are normalized to probability distributions. Between consecutive breakpoints both CDFs are linear, so
+    these values determine the CDF difference everywhere.
+    """
+    p_total = p.bin_mass.sum() + p.atom_mass.sum()
+    q_total = q.bin_mass.sum() + q.atom_mass.sum()
+    if p_total == 0 or q_total == 0:
+        raise ValueError("Both shmistograms must have some non-null mass")
+    x = _merge(_merge(p.edges, q.edges), _merge(p.atoms, q.atoms))
+    left = p.cdf(x, side="left") / p_total - q.cdf(x, side="left") / q_total
+    right = p.cdf(x, side="right") / p_total - q.cdf(x, side="right") / q_total
+    return x, left, right
+
+
+def wasserstein(p: Comparable, q: Comparable) -> float:
+    """Wasserstein-1 (earth mover's) distance between the non-null parts of p and q, each normalized to mass 1."""
+    x, left, right = _cdf_differences(_measure(p), _measure(q))
+    # On each interval the CDF difference runs linearly from a to b; integrate its absolute value exactly
+    a, b, h = right[:-1], left[1:], np.diff(x)
+    same_sign = a * b >= 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = (a**2 + b**2) / (2 * (np.abs(a) + np.abs(b)))
+    area = np.where(same_sign, (np.abs(a) + np.abs(b)) / 2, crossing) * h
+    return float(area.sum())
+
+
+def ks_statistic(p: Comparable, q: Comparable) -> float:
+    """Kolmogorov-Smirnov statistic between the non-null parts of p and q, each normalized to mass 1."""
+    _, left, right = _cdf_differences(_measure(p), _measure(q))
+    return float(max(np.abs(left).max(initial=0.0), np.abs(right).max(initial=0.0)))
+
+
+METRICS: dict[str, Callable[[Comparable, Comparable], float]] = {
+    "total_variation": total_variation,
+    "kl_divergence": kl_divergence,
+    "js_divergence": js_divergence,
+    "wasserstein": wasserstein,
+    "ks_statistic": ks_statistic,
+}
+
+
+def compare_pairs(pairs: Iterable[tuple[Comparable, Comparable]], metric: str = "js_divergence") -> np.ndarray:
+    """Compute one metric for many pairs of shmistograms.
+
+    Each distinct Shmistogram is converted to its MixtureMeasure once, however many pairs it appears in.
+
+    Args:
+        pairs: (p, q) pairs of fitted Shmistograms or MixtureMeasures
+        metric: The name of a metric in METRICS
+    """
+    func = METRICS[metric]
+    # Keep each Shmistogram alive alongside its measure, so that its id is not reused by another one
+    measures: dict[int, tuple[Comparable, MixtureMeasure]] = {}
+
+    def cached(shm: Comparable) -> MixtureMeasure:
+        if id(shm) not in measures:
+            measures[id(shm)] = (shm, _measure(shm))
+        return measures[id(shm)][1]
+
+    return np.array([func(cached(p), cached(q)) for p, q in pairs])
@@ -0,0 +1,84 @@
+"""Fast tabulation of numeric data.
+
+`fast_tabulate` is a drop-in replacement for `pandahandler.tabulation.tabulate` that picks a counting strategy by
+dtype:
+- integers with a range of at most `BINCOUNT_RANGE_RATIO` times the sample size: `np.bincount` on offset values
+- other integers and floats: sort-based `np.unique(return_counts=True)`
+- anything else (objects, categoricals, pandas extension types, lists): pandas' hash-based `value_counts`
+
+The strategy thresholds come from `demo/benchmarks.py`.
+"""
+
+from typing import Hashable, Iterable
+
+import numpy as np
+import pandas as pd
+from pandahandler.tabulation import Tabulation, tabulate
+
+from shmistogram.names import COUNT
+
+# Use bincount when the integer range is at most this multiple of the number of observations; beyond that the
+#   O(range) allocation of the bincount output outweighs the O(n log n) sort of np.unique
+BINCOUNT_RANGE_RATIO = 1
+
+
+def _numeric_array(data: Iterable[Hashable]) -> np.ndarray | None:
+    """The data as a 1-d numpy integer or float array, or None if no fast path applies."""
+    if isinstance(data, pd.Series):
+        if not isinstance(data.dtype, np.dtype):
+            return None
+        data = data.to_numpy()
+    if isinstance(data, np.ndarray) and data.ndim == 1 and data.dtype.kind in "iuf":
+        return data
+    return None
+
+
+def count_integers(array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct values and their counts for an integer array, by bincount on offset values."""
+    # Offset in intp, since narrow signed dtypes overflow when their range exceeds their maximum
+    xmin = array.min().astype(np.intp)
+    counts = np.bincount(array.astype(np.intp) - xmin)
+    (offsets,) = np.nonzero(counts)
+    return (offsets + xmin).astype(array.dtype), counts[offsets]
+
+
+def count_numeric(array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted distinct values and their counts for an integer or float array; NaN, if present, is last."""
+    if array.size and array.dtype.kind in "iu":
+        span = int(array.max()) - int(array.min())
+        if span <= BINCOUNT_RANGE_RATIO * array.size:
+            return count_integers(array)
+    return np.unique(array, return_counts=True)
+
+
+def fast_tabulate(data: Iterable[Hashable]) -> Tabulation:
+    """Tabulate data, taking a numpy fast path for integer and float arrays.
+
+    The result is identical to `pandahandler.tabulation.tabulate(data)`.
+
+    Args:
+        data: series-like object (pandas.Series, numpy 1-d array, flat list)
+    """
+    array = _numeric_array(data)
+    if array is None:
+        return tabulate(data)
+    values, counts = count_numeric(array)
+    name = getattr(data, "name", None)
+    series = pd.Series(counts.astype(np.int64), index=pd.Index(values, name=name), name=COUNT)
+    return Tabulation(counts=series, name=name, n_values=array.size, n_distinct=series.size)
+
+
+def select_mask(tabulation: Tabulation, mask: np.ndarray) -> Tabulation:
+    """Like `Tabulation.select`, but selects the distinct values with a boolean mask over `tabulation.counts`.
+
+    Args:
+        tabulation: The tabulation to subset.
+        mask: Boolean array aligned with `tabulation.counts`; True marks the distinct values to keep.
+    """
+    keep = tabulation.counts.index[mask]
+    assert isinstance(keep, pd.Index), "Expected a boolean mask to select an Index."
+    if isinstance(keep.dtype, pd.CategoricalDtype):
+        return tabulation.select(keep.tolist())
+    counts = tabulation.counts[mask]
+    assert isinstance(counts, pd.Series), "Expected a boolean mask to select a Series."
+    return Tabulation(counts=counts, name=tabulation.name, n_values=counts.sum(), n_distinct=counts.size)
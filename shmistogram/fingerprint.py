@@ -0,0 +1,84 @@
+"""Fast content fingerprints of shmistogram inputs, for use as cache keys."""
+
+import hashlib
+import inspect
+from typing import Any, Hashable, Literal, Sequence
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.binners.det import DensityEstimationTree
+
+# numpy dtype kinds whose raw buffer fully determines the values: bool, (unsigned) integer, float, complex, datetime
+_BUFFER_KINDS = "biufcmM"
+
+
+def data_fingerprint(data: Sequence[Hashable] | np.ndarray) -> str:
+    """A content hash of the input data.
+
+    Numeric numpy arrays (and numeric pandas Series) are hashed directly from their memory buffer; anything else is
+    hashed with pandas' vectorized `hash_pandas_object`.
+
+    Args:
+        data: series-like object (pandas.Series, numpy 1-d array, flat list)
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(getattr(data, "name", None)).encode())
+    array = data.to_numpy() if isinstance(data, pd.Series) else data
+    if isinstance(array, np.ndarray) and array.dtype.kind in _BUFFER_KINDS:
+        array = np.ascontiguousarray(array)
+        hasher.update(f"{array.dtype.str}{array.shape}".encode())
+        hasher.update(array.view(np.uint8).reshape(-1))
+    else:
+        hashes = pd.util.hash_pandas_object(pd.Series(data), index=False).to_numpy()  # pyright: ignore
+        hasher.update(hashes.tobytes())
+    return hasher.hexdigest()
+
+
+def binner_fingerprint(binner: Any | None) -> str | None:
+    """A hash of the binner's class and settings, or None if the settings cannot be read back.
+
+    A binner may supply its own settings key with a `cache_key()` method returning a string. Otherwise the settings
+    are the constructor parameters, read back from the attributes named like the arguments of the binner's
+    `__init__`, which is how every binner in this package stores them. A binner that stores a parameter under another
+    name, or takes *args or **kwargs, gets no fingerprint, since two differently configured instances could get the
+    same one.
+
+    Args:
+        binner: An instance of a binning class, or None for the default binner
+    """
+    binner = binner or DensityEstimationTree()
+    cls = type(binner)
+    cache_key = getattr(binner, "cache_key", None)
+    if callable(cache_key):
+        spec = f"{cls.__module__}.{cls.__qualname__}:{cache_key()}"
+    else:
+        params = [] if cls.__init__ is object.__init__ else list(inspect.signature(cls.__init__).parameters.values())
+        params = [param for param in params if param.name != "self"]
+        variadic = (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        if any(param.kind in variadic or not hasattr(binner, param.name) for param in params):
+            return None
+        names = sorted(param.name for param in params)
+        spec = f"{cls.__module__}.{cls.__qualname__}(" + ", ".join(f"{k}={getattr(binner, k)!r}" for k in names) + ")"
+    return hashlib.blake2b(spec.encode(), digest_size=16).hexdigest()
+
+
+def fit_key(
+    data: Sequence[Hashable] | np.ndarray,
+    binner: Any | None = None,
+    loner_min_count: int | Literal["auto"] | None = None,
+) -> str | None:
+    """The key identifying a Shmistogram fit: the data content, the binner settings, and `loner_min_count`.
+
+    None if the binner has no fingerprint (see `binner_fingerprint`), in which case the fit must not be shared.
+
+    Args:
+        data: series-like object (pandas.Series, numpy 1-d array, flat list)
+        binner: An instance of a binning class, or None for the default binner
+        loner_min_count: As in `Shmistogram`
+    """
+    binner_key = binner_fingerprint(binner)
+    if binner_key is None:
+        return None
+    spec = f"{data_fingerprint(data)}-{binner_key}-{loner_min_count!r}"
+    return hashlib.blake2b(spec.encode(), digest_size=16).hexdigest()
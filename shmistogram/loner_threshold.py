@@ -0,0 +1,117 @@
+"""Automatic selection of `loner_min_count` by penalized likelihood, scoring every candidate threshold in one pass.
+
+Sorting the distinct values by decreasing count, every threshold makes a prefix of that order the loners and the rest
+the crowd, so lowering the threshold only moves values from the crowd to the loners, one at a time. Each threshold is
+scored by the BIC-penalized log likelihood of the resulting mixture:
+
+- each loner value has its own probability mass, its empirical frequency;
+- the crowd has a piecewise-uniform density on a fixed grid of bins, as a fast stand-in for the binner's fit.
+
+With the grid fixed, moving a value to the loners changes only the count of its own bin, so the log likelihood of
+every threshold follows from a cumulative sum of per-move updates. To make point masses and densities commensurable,
+each crowd observation is credited with the probability of a cell of width delta around it, where delta is the
+data's quantization resolution (the median spacing between distinct values).
+"""
+
+import numpy as np
+import pandas as pd
+from pandahandler.tabulation import Tabulation
+from scipy.special import xlogy
+
+MIN_DISTINCT_VALUES = 3
+
+
+def default_loner_min_count(n_obs: int) -> float:
+    """The fixed `loner_min_count` used when none is given: ceil(log(n_obs) ** 1.3)."""
+    return np.ceil(np.log(n_obs) ** 1.3)
+
+
+def _grid(values: np.ndarray, delta: float) -> tuple[np.ndarray, np.ndarray]:
+    """Crowd bins holding roughly equal numbers of distinct values, cut halfway between neighboring values.
+
+    Returns:
+        The bin of each value and the width of each bin
+    """
+    n_values = values.shape[0]
+    n_bins = max(1, round(np.sqrt(n_values)))
+    starts = np.arange(n_bins) * n_values // n_bins
+    cuts = (values[starts[1:] - 1] + values[starts[1:]]) / 2
+    edges = np.concatenate([[values[0] - delta / 2], cuts, [values[-1] + delta / 2]])
+    bin_of = np.searchsorted(starts, np.arange(n_values), side="right") - 1
+    return bin_of, np.diff(edges)
+
+
+def loner_threshold_scores(counts: Tabulation) -> pd.DataFrame:
+    """Score every distinct candidate value of `loner_min_count`.
+
+    Null values are loners under every threshold, so they do not affect the choice and are left out. Values observed
+    only once are never loners.
+
+    Args:
+        counts: A tabulation of numeric data
+
+    Returns:
+        A DataFrame with one row per candidate threshold, in decreasing order, and columns 'threshold', 'n_loners',
+        'log_likelihood', 'penalty', and 'score' (the penalized log likelihood; higher is better)
+    """
+    series = counts.counts
+    notnull = ~pd.isnull(series.index)
+    values = series.index.to_numpy()[notnull].astype(float)
+    freq = series.to_numpy()[notnull]
+    if values.shape[0] < MIN_DISTINCT_VALUES:
+        raise ValueError(f"Automatic loner selection requires at least {MIN_DISTINCT_VALUES} distinct values")
+    n = freq.sum()
+    delta = float(np.median(np.diff(values)))
+    bin_of, width = _grid(values, delta)
+    bin_freq = np.bincount(bin_of, weights=freq)
+
+    # Move values from the crowd to the loners in order of decreasing count; find each move's bin count after it
+    order = np.argsort(-freq, kind="stable")
+    moved, moved_bin = freq[order], bin_of[order]
+    by_bin = np.argsort(moved_bin, kind="stable")
+    cumulative = np.cumsum(moved[by_bin])
+    group_start = np.flatnonzero(np.concatenate([[True], np.diff(moved_bin[by_bin]) != 0]))
+    group_size = np.diff(np.append(group_start, by_bin.shape[0]))
+    removed = np.empty_like(cumulative)
+    removed[by_bin] = cumulative - np.repeat(cumulative[group_start] - moved[by_bin][group_start], group_size)
+    after = bin_freq[moved_bin] - removed
+    before = after + moved
+
+    # Crowd: the sum over bins of m * log(m * delta / (n * width)); loners: the sum over loners of c * log(c / n)
+    scale = delta / (n * width[moved_bin])
+    crowd_ll = xlogy(bin_freq, bin_freq * delta / (n * width)).sum()
+    crowd_ll += np.concatenate([[0.0], np.cumsum(xlogy(after, after * scale) - xlogy(before, before * scale))])
+    loner_ll = np.concatenate([[0.0], np.cumsum(xlogy(moved, moved / n))])
+    log_likelihood = crowd_ll + loner_ll
+    n_loners = np.arange(values.shape[0] + 1)
+    nonempty_bins = np.concatenate([[width.shape[0]], width.shape[0] - np.cumsum(after == 0)])
+    penalty = 0.5 * (n_loners + nonempty_bins) * np.log(n)
+
+    # A threshold must take all values tied at a count together, and loners must be observed more than once
+    is_candidate = np.concatenate([[True], (moved >= 2) & (np.append(moved[1:], 0) < moved)])
+    threshold = np.concatenate([[moved[0] + 1], moved])
+    return (
+        pd.DataFrame(
+            {
+                "threshold": threshold,
+                "n_loners": n_loners,
+                "log_likelihood": log_likelihood,
+                "penalty": penalty,
+                "score": log_likelihood - penalty,
+            }
+        )
+        .loc[is_candidate]
+        .reset_index(drop=True)
+    )
+
+
+def select_loner_min_count(counts: Tabulation) -> int:
+    """The candidate `loner_min_count` with the best penalized likelihood (see `loner_threshold_scores`).
+
+    With fewer than MIN_DISTINCT_VALUES distinct non-null values there is no crowd density to weigh loners against,
+    so the default threshold applies.
+    """
+    if counts.counts.index.notna().sum() < MIN_DISTINCT_VALUES:
+        return int(default_loner_min_count(counts.n_values))
+    scores = loner_threshold_scores(counts)
+    return int(scores.threshold.iloc[int(np.argmax(scores.score.to_numpy()))])
@@ -1,5 +1,6 @@
 """Simple string constants."""
 
+AREA = "area"
 COUNT = "count"
 FREQ = "freq"
 IS_LONER = "is_loner"
@@ -8,3 +9,9 @@ RATE = "rate"
 UB = "ub"
 VALUE = "value"
 WIDTH = "width"
+X = "x"
+X_LB = "x_lb"
+X_UB = "x_ub"
+Y = "y"
+Y_LB = "y_lb"
+Y_UB = "y_ub"
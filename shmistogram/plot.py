@@ -26,6 +26,7 @@ class ShmistoGrammer:
         color_crowd="#BEBEBE",
         color_loner="#C80638",  # red
         color_null="black",
+        decimate=True,
     ):
         """Initialize a ShmistoGrammer object.
 
@@ -37,6 +38,8 @@ class ShmistoGrammer:
             color_crowd: The color of the crowd
             color_loner: The color of the loners
             color_null: The color of the null values
+            decimate: Whether to merge loners that fall within the same horizontal pixel, keeping the tallest, so
+                that rendering time is bounded by the figure width rather than by the number of loners
         """
         # Plot settings
         self.name = name
@@ -46,6 +49,7 @@ class ShmistoGrammer:
         self._triage_loners(loners)
         # Store plot settings
         self.colors = {"crowd": color_crowd, "loner": color_loner, "null": color_null}
+        self.decimate = decimate
 
     def _initialize_plot(self, ax, title):
         self.ax = ax
@@ -58,8 +62,24 @@ class ShmistoGrammer:
         self.ax.set_title(title)
 
     def _triage_loners(self, loners):
-        self.loners = loners[~np.isnan(loners.index)]
-        self.null = loners[np.isnan(loners.index)][COUNT].sum()
+        isnull = np.isnan(loners.index.to_numpy(dtype=float))
+        self.loners = loners[~isnull]
+        self.null = loners[COUNT].to_numpy()[isnull].sum()
+
+    def _decimated_loners(self):
+        """Loner values and counts, keeping only the tallest loner within each horizontal pixel of the axes."""
+        values = self.loners.index.to_numpy(dtype=float)
+        counts = self.loners[COUNT].to_numpy()
+        if not self.decimate or values.shape[0] < 2:
+            return values, counts
+        xmin, xmax = self.ax.get_xlim()
+        xmin, xmax = min(xmin, values[0]), max(xmax, values[-1])
+        width_px = max(self.ax.get_window_extent().width, 1.0)
+        pixel = np.floor((values - xmin) / (xmax - xmin) * width_px).astype(np.int64)
+        # Sort by pixel, then by count, so that the last loner in each pixel is the tallest
+        order = np.lexsort((counts, pixel))
+        keep = order[np.flatnonzero(np.diff(pixel[order], append=pixel[order][-1] + 1))]
+        return values[keep], counts[keep]
 
     def _bin_edges(self):
         assert isinstance(self.bins, pd.DataFrame), "Bins must be a DataFrame"
@@ -134,19 +154,36 @@ class ShmistoGrammer:
         axl.set_ylabel("Loner count", color=self.colors["loner"])
         marg_mult = (self.ymax + self.ymarg) / self.ymax
         axl.set_ylim(0, self.loners[COUNT].max() * marg_mult)
-        # add the loner count line segments
-        lines = [[(idx, 0), (idx, row[COUNT])] for idx, row in self.loners.iterrows()]
-        lc = mc.LineCollection(lines, colors=self.colors["loner"], linewidths=0.6)
-        axl.add_collection(lc)
-        axl.plot(
-            self.loners.index.to_numpy(),
-            self.loners[COUNT].to_numpy(),
+        self._draw_loners(axl)
+
+    def _draw_loners(self, ax):
+        """Draw each loner count as a vertical line segment topped by a marker."""
+        # add the loner count line segments, as an (n, 2, 2) array of [(value, 0), (value, count)] pairs
+        values, counts = self._decimated_loners()
+        segments = np.zeros((values.shape[0], 2, 2))
+        segments[:, :, 0] = values[:, np.newaxis]
+        segments[:, 1, 1] = counts
+        lc = mc.LineCollection(segments, colors=self.colors["loner"], linewidths=0.6)  # pyright: ignore[reportArgumentType]
+        ax.add_collection(lc)
+        ax.plot(
+            values,
+            counts,
             marker="o",
             color=self.colors["loner"],
             markersize=3,
             linestyle="None",  # Add this line to remove the connecting line
         )
 
+    def _loners_only(self):
+        """Plot data without a crowd, e.g. a column of a few status codes, as loner counts on the primary axis."""
+        self.ax.set_ylabel("Loner count", color=self.colors["loner"])
+        if self.loners.shape[0] > 0:
+            self._draw_loners(self.ax)
+            # Leave headroom above the tallest loner for the null count
+            self.ax.set_ylim(0, self.loners[COUNT].max() * 1.2)
+        if self.null > 0:
+            self.ax.text(0.02, 0.98, f"null: {self.null}", transform=self.ax.transAxes, va="top")
+
     def plot(self, ax=None, show=False, title="Shmistogram"):
         """Plot the Shmistogram.
 
@@ -155,14 +192,12 @@ class ShmistoGrammer:
             show: Whether to show the plot
             title: The title of the plot
         """
-        assert isinstance(self.bins, pd.DataFrame), "Bins must be a DataFrame"
-        if self.bins.shape[0] == 0:
-            print("This data is 100% loners:")
-            print(self.loners)
-            return None
         self._initialize_plot(ax, title)
-        self._bins()
-        self._loners()
+        if self.bins is None or self.bins.shape[0] == 0:
+            self._loners_only()
+        else:
+            self._bins()
+            self._loners()
         if show:
             plt.show()
 
@@ -0,0 +1,103 @@
+"""Precomputed index for fast range queries against a fitted Shmistogram.
+
+Range mass is answered from the cumulative crowd count at each bin edge, interpolated linearly within a bin since
+the crowd density is piecewise uniform, plus prefix sums of the counts of the loners sorted by value: O(log k) for k
+bins and loners. Range top-k uses a sparse table of argmax positions over the sorted loner counts: each range maximum
+is two table lookups, and the k largest are peeled off with a heap of subranges in O(log n + k log k).
+"""
+
+import heapq
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.names import COUNT, FREQ, LB, UB
+
+
+def _sparse_argmax_table(counts: np.ndarray) -> list[np.ndarray]:
+    """table[j][i] is the position of the largest count in counts[i : i + 2**j], the leftmost one among ties."""
+    table = [np.arange(counts.shape[0])]
+    span = 1
+    while 2 * span <= counts.shape[0]:
+        prev = table[-1]
+        left, right = prev[: prev.shape[0] - span], prev[span:]
+        table.append(np.where(counts[right] > counts[left], right, left))
+        span *= 2
+    return table
+
+
+class QueryIndex:
+    """Range-mass and range top-k queries over the observations summarized by a fitted Shmistogram.
+
+    Usually built by way of `Shmistogram.query_index`. Masses are fractions of all observations, nulls included; null
+    values lie in no range.
+    """
+
+    def __init__(self, bins: pd.DataFrame | None, loners: pd.Series, n_obs: int) -> None:
+        """Build the index.
+
+        Args:
+            bins: The crowd bins of a Shmistogram, or None
+            loners: The loner counts of a Shmistogram, indexed by the sorted loner values with any null last
+            n_obs: The total number of observations
+        """
+        self.n_obs = n_obs
+        if bins is None or bins.shape[0] == 0:
+            self.edges = np.array([0.0, 0.0])
+            self.crowd_cumsum = np.array([0.0, 0.0])
+        else:
+            self.edges = np.append(bins[LB].to_numpy()[:1], bins[UB].to_numpy()).astype(float)
+            self.crowd_cumsum = np.append(0.0, np.cumsum(bins[FREQ].to_numpy()))
+        values = loners.index.to_numpy(dtype=float)
+        notnull = ~np.isnan(values)
+        self.loner_values = values[notnull]
+        self.loner_counts = loners.to_numpy()[notnull]
+        self.loner_cumsum = np.append(0, np.cumsum(self.loner_counts))
+        self._argmax = _sparse_argmax_table(self.loner_counts)
+
+    def range_masses(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """The fraction of all observations in each closed interval [a, b]; zero where a > b.
+
+        Args:
+            a: Lower ends of the intervals
+            b: Upper ends of the intervals, broadcastable against `a`
+        """
+        a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+        crowd = np.interp(b, self.edges, self.crowd_cumsum) - np.interp(a, self.edges, self.crowd_cumsum)
+        lo = np.searchsorted(self.loner_values, a, side="left")
+        hi = np.searchsorted(self.loner_values, b, side="right")
+        loners = self.loner_cumsum[np.maximum(hi, lo)] - self.loner_cumsum[lo]
+        return np.where(a <= b, (crowd + loners) / self.n_obs, 0.0)
+
+    def range_mass(self, a: float, b: float) -> float:
+        """The fraction of all observations in the closed interval [a, b]."""
+        return float(self.range_masses(np.array(a), np.array(b)))
+
+    def _range_argmax(self, lo: int, hi: int) -> int:
+        """The position of the largest loner count among positions lo through hi - 1 (requires lo < hi)."""
+        j = (hi - lo).bit_length() - 1
+        left, right = self._argmax[j][lo], self._argmax[j][hi - (1 << j)]
+        return int(right if self.loner_counts[right] > self.loner_counts[left] else left)
+
+    def top_k(self, a: float, b: float, k: int) -> pd.Series:
+        """The k most frequent loners in the closed interval [a, b].
+
+        Returns:
+            The counts of up to k loners, indexed by value, in descending order of count (ascending value among ties)
+        """
+        lo = int(np.searchsorted(self.loner_values, a, side="left"))
+        hi = int(np.searchsorted(self.loner_values, b, side="right"))
+        found = []
+        heap = []
+        if lo < hi:
+            top = self._range_argmax(lo, hi)
+            heap.append((-self.loner_counts[top], top, lo, hi))
+        while heap and len(found) < k:
+            _, top, lo, hi = heapq.heappop(heap)
+            found.append(top)
+            for sub_lo, sub_hi in [(lo, top), (top + 1, hi)]:
+                if sub_lo < sub_hi:
+                    sub_top = self._range_argmax(sub_lo, sub_hi)
+                    heapq.heappush(heap, (-self.loner_counts[sub_top], sub_top, sub_lo, sub_hi))
+        idx = np.array(found, dtype=int)
+        return pd.Series(self.loner_counts[idx], index=pd.Index(self.loner_values[idx]), name=COUNT)
@@ -0,0 +1,112 @@
+"""Headless rendering of shmistograms to image files, without pyplot global state.
+
+Each thread keeps one Agg-backed Figure per (figsize, dpi) and clears it between renders, so rendering many images
+neither leaks figures nor pays for figure construction each time. `render_many` fans renders out over a process pool.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Sequence
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from shmistogram.plot import ShmistoGrammer
+from shmistogram.shmistogram import Shmistogram
+
+FIGSIZE = (6.4, 4.8)
+DPI = 100
+CHUNKS_PER_WORKER = 4
+
+_templates = threading.local()
+
+
+def _template(figsize: tuple[float, float], dpi: float) -> Figure:
+    """A reusable figure of the given size, private to the calling thread, cleared and ready to draw on."""
+    figures = _templates.__dict__.setdefault("figures", {})
+    fig = figures.get((figsize, dpi))
+    if fig is None:
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+        figures[(figsize, dpi)] = fig
+    fig.clear()
+    return fig
+
+
+def _plot_inputs(shm: Shmistogram) -> dict[str, Any]:
+    """The data that ShmistoGrammer needs, which is much cheaper to send to a worker process than the Shmistogram."""
+    return {
+        "bins": shm.bins,
+        "loners": shm.loners.counts.to_frame(),
+        "loner_crowd_shares": shm.loner_crowd_shares,
+    }
+
+
+def _render(
+    plot_inputs: dict[str, Any],
+    outfile: str | os.PathLike,
+    name: str = "values",
+    title: str = "Shmistogram",
+    figsize: tuple[float, float] = FIGSIZE,
+    dpi: float = DPI,
+) -> None:
+    fig = _template(figsize, dpi)
+    plotter = ShmistoGrammer(name=name, **plot_inputs)
+    plotter.plot(ax=fig.add_subplot(), title=title)
+    fig.subplots_adjust(bottom=0.25)
+    fig.savefig(outfile)
+
+
+def render(
+    shm: Shmistogram,
+    outfile: str | os.PathLike,
+    name: str = "values",
+    title: str = "Shmistogram",
+    figsize: tuple[float, float] = FIGSIZE,
+    dpi: float = DPI,
+) -> None:
+    """Render a shmistogram to an image file; safe to call from multiple threads.
+
+    Args:
+        shm: A fitted Shmistogram
+        outfile: The path to save the image to; the file extension sets the format
+        name: The name of the x-axis
+        title: The title of the plot
+        figsize: The figure size in inches
+        dpi: The resolution in dots per inch
+    """
+    _render(_plot_inputs(shm), outfile, name=name, title=title, figsize=figsize, dpi=dpi)
+
+
+def _render_job(job: tuple[dict[str, Any], str | os.PathLike, dict[str, Any]]) -> None:
+    plot_inputs, outfile, kwargs = job
+    _render(plot_inputs, outfile, **kwargs)
+
+
+def render_many(
+    shms: Sequence[Shmistogram],
+    outfiles: Sequence[str | os.PathLike],
+    max_workers: int | None = None,
+    **kwargs: Any,
+) -> None:
+    """Render many shmistograms to image files across a pool of worker processes.
+
+    Args:
+        shms: Fitted Shmistograms
+        outfiles: One output path per shmistogram
+        max_workers: The number of worker processes; None means one per CPU and 1 means render in this process
+        kwargs: Passed to `render`
+    """
+    if len(shms) != len(outfiles):
+        raise ValueError("Expected one outfile per shmistogram")
+    jobs = [(_plot_inputs(shm), outfile, kwargs) for shm, outfile in zip(shms, outfiles)]
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        for job in jobs:
+            _render_job(job)
+        return
+    chunksize = max(1, len(jobs) // (max_workers * CHUNKS_PER_WORKER))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        # Consume the iterator so that worker exceptions are raised here
+        list(executor.map(_render_job, jobs, chunksize=chunksize))
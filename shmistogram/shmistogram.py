@@ -1,15 +1,28 @@
 """Shmistogram class for creating a histogram-like plot with loners and the crowd."""
 
-from typing import Any, Hashable, Iterable, Sequence
+import asyncio
+import copy
+import functools
+import os
+from concurrent.futures import Executor
+from functools import cached_property
+from typing import Any, Hashable, Literal, Sequence
 
 import numpy as np
 import pandas as pd
 from matplotlib import pyplot as plt
-from pandahandler.tabulation import Tabulation, tabulate
+from pandahandler.tabulation import Tabulation
 
+from shmistogram.binners.base import as_binner, capabilities
 from shmistogram.binners.det import DensityEstimationTree
-from shmistogram.names import IS_LONER
+from shmistogram.coalesce import coalesce
+from shmistogram.counting import select_mask
+from shmistogram.fingerprint import fit_key
+from shmistogram.loner_threshold import default_loner_min_count, select_loner_min_count
 from shmistogram.plot import ShmistoGrammer
+from shmistogram.query import QueryIndex
+from shmistogram.streaming import as_tabulation, is_out_of_core
+from shmistogram.validation import full_validation
 
 Axes = plt.Axes  # pyright: ignore[reportPrivateImportUsage]
 
@@ -19,31 +32,47 @@ class Shmistogram:
 
     def __init__(
         self,
-        data: Sequence[Hashable] | np.ndarray,
+        data: Sequence[Hashable] | np.ndarray | Tabulation | str | os.PathLike,
         *,
         binner: Any | None = None,
-        loner_min_count: int | None = None,
+        loner_min_count: int | Literal["auto"] | None = None,
+        release_binner_data: bool = True,
     ):
         """Initialize a Shmistogram object.
 
         Args:
-            data: series-like object (pandas.Series, numpy 1-d array, flat list)
-            binner: An instance of a binning class with a fit() method, or None
+            data: series-like object (pandas.Series, numpy 1-d array, flat list), a precomputed Tabulation, or an
+                out-of-core numeric column: a path to a .npy or Arrow IPC file, a numpy memmap, or a pyarrow array.
+                Out-of-core columns are tabulated page by page (see `shmistogram.streaming`).
+            binner: An instance of a binning class implementing the `Binner` protocol (i.e. with a
+                fit_arrays() method), an instance of a legacy binning class with a fit() method, or None
             loner_min_count: Observations with a frequency of at least `loner_min_count` are
-                eligible to be considered 'loners'
+                eligible to be considered 'loners'. 'auto' picks the threshold that maximizes a penalized likelihood
+                of the loner/crowd mixture (see `shmistogram.loner_threshold`); None means ceil(log(n_obs) ** 1.3).
+            release_binner_data: Whether to call the binner's drop_training_data() method, if it has one, once the
+                bins are fit. The Shmistogram keeps a reference to its binner, which would otherwise hold on to a
+                copy of the crowd data for as long as the Shmistogram lives.
             verbose: Whether to print progress messages
         """
-        self.n_obs = len(data)
+        counts = as_tabulation(data)
+        self.n_obs = counts.n_values
         self.binner = binner or DensityEstimationTree()
-        self.loner_min_count = loner_min_count or np.ceil(np.log(self.n_obs) ** 1.3)
+        if loner_min_count == "auto":
+            self.loner_min_count = select_loner_min_count(counts)
+        else:
+            self.loner_min_count = loner_min_count or default_loner_min_count(self.n_obs)
 
         # Tabulation
-        self._tabulate_loners_and_the_crowd(data)
+        self._tabulate_loners_and_the_crowd(counts)
         self.n_loners = self.loners.n_values
 
         # Binning
         if self.crowd.n_values > 1:
-            self.bins = self.binner.fit(self.crowd.counts.to_frame())
+            crowd = self.crowd.counts
+            self.bins = as_binner(self.binner).fit_arrays(crowd.index.to_numpy(), crowd.to_numpy())
+            drop_training_data = getattr(self.binner, "drop_training_data", None)
+            if release_binner_data and callable(drop_training_data):
+                drop_training_data()
         else:
             assert self.crowd.n_values == 0
             self.bins = None
@@ -52,28 +81,72 @@ class Shmistogram:
         if (self.bins is None) or (self.bins.shape[0] == 0):
             assert self.loner_crowd_shares[1] == 0
 
-    def _tabulate_loners_and_the_crowd(self, data: Iterable[Hashable]) -> None:
+    @classmethod
+    async def afit(
+        cls,
+        data: Sequence[Hashable] | np.ndarray | Tabulation | str | os.PathLike,
+        *,
+        executor: Executor | None = None,
+        binner: Any | None = None,
+        loner_min_count: int | Literal["auto"] | None = None,
+        release_binner_data: bool = True,
+    ) -> "Shmistogram":
+        """Fit a Shmistogram without blocking the asyncio event loop.
+
+        Tabulation and binning run in `executor`. Concurrent calls with identical in-memory data and settings, for a
+        binner whose settings can be fingerprinted (see `shmistogram.fingerprint.binner_fingerprint`), share one fit,
+        and so return the same Shmistogram, which callers should treat as read-only. Tabulations and out-of-core data
+        (see `shmistogram.streaming.is_out_of_core`) are never shared, since hashing them would defeat paging. Cancelling the awaiting task also
+        stops the fit at the binner's next split or merge, unless another call is still waiting on it (see
+        `shmistogram.coalesce`).
+
+        Args:
+            data: As in `Shmistogram`
+            executor: The executor to fit in, or None for the event loop's default executor. A process pool works
+                too, but then the fit is not cancellable.
+            binner: As in `Shmistogram`. Binners that do not declare themselves thread safe are copied first, since
+                they keep the state of a fit on the instance.
+            loner_min_count: As in `Shmistogram`
+            release_binner_data: As in `Shmistogram`
+        """
+        if binner is not None and not capabilities(binner).thread_safe:
+            binner = copy.deepcopy(binner)
+        fit = functools.partial(
+            cls, data, binner=binner, loner_min_count=loner_min_count, release_binner_data=release_binner_data
+        )
+        key = None
+        # Out-of-core data is not keyed, since hashing it would read it all into memory or in a second full pass
+        if not isinstance(data, (Tabulation, str, os.PathLike)) and not is_out_of_core(data):
+            # Hashing the data is O(n) too, so keep it off the event loop as well
+            loop = asyncio.get_running_loop()
+            key = await loop.run_in_executor(None, fit_key, data, binner, loner_min_count)
+            key = None if key is None else f"{key}-{release_binner_data}"
+        return await coalesce(key, fit, executor)
+
+    def _tabulate_loners_and_the_crowd(self, counts: Tabulation) -> None:
         """Break observations into 'loners' and the 'crowd'.
 
         The total distribution will be a mixture between a multinomial (for the loners) and
         a piecewise uniform distribution (for the crowd).
 
         Args:
-            data: A tabulation of the the data.
+            counts: A tabulation of the the data.
         """
-        counts: Tabulation = tabulate(data)
-        xdf = counts.counts.to_frame()
-        xdf[IS_LONER] = (xdf["count"] >= self.loner_min_count) | pd.isnull(xdf.index)
-        if xdf.shape[0] - xdf[IS_LONER].sum() == 1:
+        is_loner = (counts.counts.to_numpy() >= self.loner_min_count) | pd.isnull(counts.counts.index)
+        if is_loner.size - is_loner.sum() == 1:
             # If there is only one non-loner, let's call it a loner too
-            xdf[IS_LONER] = xdf[IS_LONER].replace(False, True)
-        which_loners = xdf.loc[xdf[IS_LONER]].index.tolist()
-        which_crowd = xdf.loc[~xdf[IS_LONER]].index.tolist()
-        self.loners = counts.select(which_loners)
-        self.crowd = counts.select(which_crowd)
-        assert self.loners.n_values + self.crowd.n_values == counts.n_values, "counts mismatch!"
+            is_loner[:] = True
+        self.loners = select_mask(counts, is_loner)
+        self.crowd = select_mask(counts, ~is_loner)
+        if full_validation():
+            assert self.loners.n_values + self.crowd.n_values == counts.n_values, "counts mismatch!"
         self.loner_crowd_shares = np.array([self.loners.n_values, self.crowd.n_values]) / self.n_obs
 
+    @cached_property
+    def query_index(self) -> QueryIndex:
+        """An index for fast range-mass and range top-k loner queries, built on first access."""
+        return QueryIndex(bins=self.bins, loners=self.loners.counts, n_obs=self.n_obs)
+
     def plot(
         self,
         ax: Axes | None = None,
@@ -86,7 +159,7 @@ class Shmistogram:
         Args:
             ax: A matplotlib Axes object, or None
             name: The name of the x-axis
-            outfile: The path to save the plot to, or None
+            outfile: The path to save the plot to, or None. To render many files, prefer `shmistogram.render`
             show: Whether to show the plot
         """
         plotter = ShmistoGrammer(
@@ -96,6 +169,9 @@ class Shmistogram:
             name=name,
         )
         plotter.plot(ax=ax, show=show)
-        plt.gcf().subplots_adjust(bottom=0.25)
+        # Stay off pyplot's global state when the caller supplies the axes; see also `shmistogram.render`
+        fig = ax.figure if ax is not None else plt.gcf()
+        fig.subplots_adjust(bottom=0.25)
         if outfile is not None:
-            plt.savefig(outfile)
+            # A SubFigure saves by way of its root Figure
+            fig.figure.savefig(outfile)
@@ -0,0 +1,88 @@
+"""Joint shmistogram of a pair of columns: repeated (x, y) points as loners and the rest binned into boxes."""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from shmistogram.binners.base import as_binner
+from shmistogram.binners.det2d import DensityEstimationTree2D
+from shmistogram.names import COUNT, X, Y
+
+
+def tabulate_pairs(x: np.ndarray, y: np.ndarray) -> pd.DataFrame:
+    """Count each distinct (x, y) pair.
+
+    Returns:
+        A DataFrame with columns 'x', 'y', and 'count', sorted by (x, y), with any pairs that include a NaN last
+    """
+    isnull = np.isnan(x) | np.isnan(y)
+    xs, ys = x[~isnull], y[~isnull]
+    # lexsort on the two columns is several times faster than np.unique(axis=0), which sorts rows as structs
+    order = np.lexsort((ys, xs))
+    xs, ys = xs[order], ys[order]
+    starts = np.flatnonzero(np.concatenate([[True], (xs[1:] != xs[:-1]) | (ys[1:] != ys[:-1])]))[: xs.shape[0]]
+    counts = np.diff(np.append(starts, xs.shape[0]))
+    df = pd.DataFrame({X: xs[starts], Y: ys[starts], COUNT: counts})
+    if isnull.any():
+        nulls = pd.DataFrame({X: x[isnull], Y: y[isnull]}).value_counts(dropna=False, sort=False)
+        df = pd.concat([df, nulls.rename(COUNT).reset_index()], ignore_index=True)
+    return df
+
+
+class Shmistogram2D:
+    """Joint shmistogram of two numeric columns.
+
+    As for the univariate `Shmistogram`, (x, y) points observed at least `loner_min_count` times, as well as any
+    points with a null coordinate, are 'loners'; the remaining 'crowd' is binned by a bivariate density estimation
+    tree.
+    """
+
+    def __init__(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        *,
+        binner: Any | None = None,
+        loner_min_count: int | None = None,
+        release_binner_data: bool = True,
+    ):
+        """Initialize a Shmistogram2D object.
+
+        Args:
+            x: numeric 1-d array-like
+            y: numeric 1-d array-like of the same length as x
+            binner: An instance of a bivariate binning class with a fit_arrays() method, or None
+            loner_min_count: Points with a frequency of at least `loner_min_count` are eligible to be considered
+                'loners'
+            release_binner_data: Whether to call the binner's drop_training_data() method, if it has one, once the
+                bins are fit
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if x.shape != y.shape or x.ndim != 1:
+            raise ValueError("x and y must be 1-d arrays of the same length")
+        self.n_obs = x.shape[0]
+        self.binner = binner or DensityEstimationTree2D()
+        self.loner_min_count = loner_min_count or np.ceil(np.log(self.n_obs) ** 1.3)
+
+        # Tabulation
+        counts = tabulate_pairs(x, y)
+        isnull = np.isnan(counts[X].to_numpy()) | np.isnan(counts[Y].to_numpy())
+        is_loner = (counts[COUNT].to_numpy() >= self.loner_min_count) | isnull
+        if is_loner.size - is_loner.sum() == 1:
+            # If there is only one non-loner, let's call it a loner too
+            is_loner[:] = True
+        self.loners = counts.loc[is_loner].reset_index(drop=True)
+        self.crowd = counts.loc[~is_loner].reset_index(drop=True)
+        self.loner_crowd_shares = np.array([self.loners[COUNT].sum(), self.crowd[COUNT].sum()]) / self.n_obs
+
+        # Binning
+        if self.crowd.shape[0] > 1:
+            values = self.crowd[[X, Y]].to_numpy()
+            self.bins = as_binner(self.binner).fit_arrays(values, self.crowd[COUNT].to_numpy())
+            drop_training_data = getattr(self.binner, "drop_training_data", None)
+            if release_binner_data and callable(drop_training_data):
+                drop_training_data()
+        else:
+            self.bins = None
@@ -0,0 +1,148 @@
+"""Out-of-core tabulation of numeric columns stored in memory-mapped .npy files or Arrow IPC files.
+
+The data is read in fixed-size pages straight from the mapped buffer; each page is tabulated with
+`shmistogram.counting.count_numeric`, and the page tabulations are merged log-structurally, like carries in a binary
+counter, so that each distinct value takes part in O(log(pages)) merges rather than one merge per page. Resident
+memory is bounded by the page size plus O(log(pages)) runs of at most the number of distinct values each, regardless
+of the file size.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Hashable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+from pandahandler.tabulation import Tabulation
+
+from shmistogram.counting import count_numeric, fast_tabulate
+from shmistogram.names import COUNT
+
+PAGE_SIZE = 2**20
+
+NPY_SUFFIXES = (".npy",)
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+
+
+def _is_arrow(data: Any) -> bool:
+    return type(data).__module__.split(".")[0] == "pyarrow"
+
+
+def is_out_of_core(data: Any) -> bool:
+    """Whether `data` is a file path, a numpy memmap, or an Arrow array, all of which are tabulated page by page."""
+    return isinstance(data, (str, os.PathLike, np.memmap)) or _is_arrow(data)
+
+
+def _array_pages(array: np.ndarray, page_size: int) -> Iterator[np.ndarray]:
+    for start in range(0, array.shape[0], page_size):
+        # Slicing a memmap is a view; nothing is read from disk until the page is counted
+        yield array[start : start + page_size]
+
+
+def _arrow_pages(array: Any, page_size: int) -> Iterator[np.ndarray]:
+    for chunk in getattr(array, "chunks", [array]):
+        for start in range(0, len(chunk), page_size):
+            # Zero-copy unless the page has nulls, which become NaN
+            yield chunk.slice(start, page_size).to_numpy(zero_copy_only=False)
+
+
+def _arrow_file_pages(path: Path, page_size: int, column: str | int) -> Iterator[np.ndarray]:
+    try:
+        import pyarrow as pa  # pyright: ignore[reportMissingImports]
+    except ImportError as err:
+        raise ImportError("Reading Arrow IPC files requires pyarrow: pip install pyarrow") from err
+    with pa.memory_map(str(path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        except pa.ArrowInvalid:
+            source.seek(0)
+            batches = pa.ipc.open_stream(source)
+        for batch in batches:
+            yield from _arrow_pages(batch.column(column), page_size)
+
+
+def iter_pages(source: Any, page_size: int = PAGE_SIZE, column: str | int = 0) -> Iterator[np.ndarray]:
+    """Iterate over a numeric column in pages of at most `page_size` values.
+
+    Args:
+        source: A path to a .npy file or an Arrow IPC (a.k.a. feather v2) file, a numpy array or memmap, or a pyarrow
+            Array or ChunkedArray
+        page_size: The maximum number of values per page
+        column: The column to read from an Arrow IPC file, by name or position
+    """
+    if isinstance(source, (str, os.PathLike)):
+        path = Path(source)
+        if path.suffix in NPY_SUFFIXES:
+            yield from _array_pages(np.load(path, mmap_mode="r"), page_size)
+        elif path.suffix in ARROW_SUFFIXES:
+            yield from _arrow_file_pages(path, page_size, column)
+        else:
+            raise ValueError(f"Unsupported file type {path.suffix!r}; expected one of {NPY_SUFFIXES + ARROW_SUFFIXES}")
+    elif _is_arrow(source):
+        yield from _arrow_pages(source, page_size)
+    else:
+        yield from _array_pages(np.asarray(source), page_size)
+
+
+def merge_counts(
+    values: np.ndarray, counts: np.ndarray, other_values: np.ndarray, other_counts: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Merge two tabulations, each given as sorted distinct values and their counts."""
+    merged = np.concatenate([values, other_values])
+    merged_counts = np.concatenate([counts, other_counts])
+    if merged.size == 0:
+        return merged, merged_counts
+    # A stable sort detects the two sorted runs and merges them in linear time
+    order = np.argsort(merged, kind="stable")
+    merged = merged[order]
+    starts = np.flatnonzero(np.concatenate([[True], merged[1:] != merged[:-1]]))
+    return merged[starts], np.add.reduceat(merged_counts[order], starts)
+
+
+def tabulate_pages(pages: Iterable[np.ndarray]) -> Tabulation:
+    """Tabulate numeric data that arrives in pages, accumulating the counts of each page.
+
+    NaN values are counted as a single null value, sorted last, as in `fast_tabulate`.
+
+    Args:
+        pages: 1-d numpy integer or float arrays
+    """
+    # Runs of (values, counts, number of pages), with strictly decreasing powers of two as the numbers of pages
+    runs: list[tuple[np.ndarray, np.ndarray, int]] = []
+    n_values = n_null = 0
+    for page in pages:
+        if page.dtype.kind not in "iuf":
+            raise TypeError(f"Paged tabulation requires integer or float data, not {page.dtype}")
+        n_values += page.shape[0]
+        if page.dtype.kind == "f":
+            isnull = np.isnan(page)
+            n_null += int(isnull.sum())
+            page = page[~isnull]
+        runs.append((*count_numeric(page), 1))
+        while len(runs) > 1 and runs[-1][2] >= runs[-2][2]:
+            values, counts, n_pages = runs.pop()
+            prev_values, prev_counts, prev_pages = runs.pop()
+            runs.append((*merge_counts(prev_values, prev_counts, values, counts), prev_pages + n_pages))
+    values, counts, _ = runs.pop() if runs else (np.array([], dtype=float), np.array([], dtype=np.int64), 0)
+    for run_values, run_counts, _ in reversed(runs):
+        values, counts = merge_counts(run_values, run_counts, values, counts)
+    if n_null:
+        values = np.append(values.astype(float), np.nan)
+        counts = np.append(counts, n_null)
+    series = pd.Series(counts.astype(np.int64), index=pd.Index(values), name=COUNT)
+    return Tabulation(counts=series, n_values=n_values, n_distinct=series.size)
+
+
+def tabulate_source(source: Any, page_size: int = PAGE_SIZE, column: str | int = 0) -> Tabulation:
+    """Tabulate a numeric column page by page; see `iter_pages` for the arguments."""
+    return tabulate_pages(iter_pages(source, page_size=page_size, column=column))
+
+
+def as_tabulation(data: Iterable[Hashable] | Tabulation | Any) -> Tabulation:
+    """Tabulate any input accepted by `Shmistogram`, streaming through out-of-core sources."""
+    if isinstance(data, Tabulation):
+        return data
+    if is_out_of_core(data):
+        return tabulate_source(data)
+    return fast_tabulate(data)
@@ -0,0 +1,56 @@
+"""The validation level: how much internal consistency checking runs during fits.
+
+At the 'fast' level (the default) only O(1) invariant checks run. At the 'full' level, binners also run checks that
+cost O(k) or O(n) per iteration, such as re-summing all leaf counts after every tree split, which is what the test
+suite uses. The default comes from the SHMISTOGRAM_VALIDATION environment variable, if set, and can be overridden for
+the whole process with `set_validation_level` or for a block of code with `validation`.
+"""
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Literal
+
+ENV_VAR = "SHMISTOGRAM_VALIDATION"
+FAST = "fast"
+FULL = "full"
+
+ValidationLevel = Literal["fast", "full"]
+
+
+def _checked(level: str) -> ValidationLevel:
+    if level == FAST:
+        return FAST
+    if level == FULL:
+        return FULL
+    raise ValueError(f"Unknown validation level {level!r}; expected {FAST!r} or {FULL!r}")
+
+
+_default: ValidationLevel = _checked(os.environ.get(ENV_VAR, FAST))
+_override: ContextVar[ValidationLevel | None] = ContextVar("shmistogram_validation", default=None)
+
+
+def get_validation_level() -> ValidationLevel:
+    """The validation level in effect in the current context."""
+    return _override.get() or _default
+
+
+def set_validation_level(level: ValidationLevel) -> None:
+    """Set the validation level for the whole process, except where overridden by `validation`."""
+    global _default
+    _default = _checked(level)
+
+
+@contextmanager
+def validation(level: ValidationLevel) -> Iterator[None]:
+    """Use the given validation level within this context."""
+    token = _override.set(_checked(level))
+    try:
+        yield
+    finally:
+        _override.reset(token)
+
+
+def full_validation() -> bool:
+    """Whether the O(k) and O(n) consistency checks should run."""
+    return get_validation_level() == FULL
@@ -0,0 +1,5 @@
+"""Test configuration: run every internal consistency check, whereas fits default to the fast validation level."""
+
+from shmistogram.validation import FULL, set_validation_level
+
+set_validation_level(FULL)
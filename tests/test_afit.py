@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shmistogram import Shmistogram
+from shmistogram.binners.agglomerate import Agglomerator
+from shmistogram.binners.base import FitCancelled, cancel_on
+from shmistogram.binners.det import DensityEstimationTree
+from shmistogram.simulations.univariate import cauchy_mixture
+
+
+def test_afit_matches_fit():
+    data = cauchy_mixture(size=2000, seed=0)
+    shm = asyncio.run(Shmistogram.afit(data))
+    assert shm.bins is not None
+    pd.testing.assert_frame_equal(shm.bins, Shmistogram(data).bins)  # pyright: ignore
+
+
+def test_afit_coalesces_identical_requests():
+    data = cauchy_mixture(size=2000, seed=0)
+    other = cauchy_mixture(size=2000, seed=1)
+
+    async def main():
+        return await asyncio.gather(Shmistogram.afit(data), Shmistogram.afit(data.copy()), Shmistogram.afit(other))
+
+    first, second, third = asyncio.run(main())
+    assert first is second
+    assert third is not first
+
+
+def test_afit_does_not_hash_out_of_core_data(tmp_path, monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    data = cauchy_mixture(size=2000, seed=0)
+    np.save(tmp_path / "data.npy", data)
+    sources = [np.load(tmp_path / "data.npy", mmap_mode="r"), pa.chunked_array([data[:1000], data[1000:]])]
+
+    def fail(*args):
+        raise AssertionError("out-of-core data was hashed")
+
+    monkeypatch.setattr("shmistogram.shmistogram.fit_key", fail)
+    expected = Shmistogram(data).bins
+    for source in sources:
+        shm = asyncio.run(Shmistogram.afit(source))
+        pd.testing.assert_frame_equal(shm.bins, expected)  # pyright: ignore
+
+
+def test_check_cancelled_stops_binners():
+    cancel = threading.Event()
+    cancel.set()
+    values = np.sort(cauchy_mixture(size=500, seed=0))
+    counts = np.ones_like(values, dtype=int)
+    for binner in [DensityEstimationTree(), Agglomerator(n_bins=5)]:
+        with cancel_on(cancel), pytest.raises(FitCancelled):
+            binner.fit_arrays(values, counts)
+        # Outside the context the fit is not cancellable
+        binner.fit_arrays(values, counts)
+
+
+def test_cancelling_afit_cancels_the_fit():
+    # One merge at a time over thousands of pre-bins takes many seconds unless it is cancelled
+    data = cauchy_mixture(size=20_000, truncate=True, seed=0)
+    binner = Agglomerator(n_bins=2, prebin_maxbins=5000)
+    executor = ThreadPoolExecutor(max_workers=1)
+
+    async def main():
+        task = asyncio.create_task(Shmistogram.afit(data, executor=executor, binner=binner))
+        await asyncio.sleep(0.5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    t0 = time.perf_counter()
+    asyncio.run(main())
+    executor.shutdown(wait=True)
+    assert time.perf_counter() - t0 < 5
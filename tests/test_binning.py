@@ -1,7 +1,15 @@
+import pickle
+
+import numpy as np
 import pandas as pd
+import pytest
 
 import shmistogram as shm
+from shmistogram.binners.agglomerate import Agglomerator
+from shmistogram.binners.base import Binner, BinnerCapabilities, FrameBinnerAdapter, as_binner, capabilities
+from shmistogram.binners.bayesblocks import BayesianBlocks
 from shmistogram.binners.det import DensityEstimationTree
+from shmistogram.names import COUNT, FREQ, LB, RATE, UB, WIDTH
 from shmistogram.simulations.univariate import cauchy_mixture
 
 
@@ -31,3 +39,81 @@ def test_det_n_bin():
         }
     )
     pd.testing.assert_frame_equal(det.bins, expected_bins)
+
+
+def test_legacy_binner_adapter():
+    """A binner with only a DataFrame fit() method is adapted to the Binner protocol."""
+
+    class LegacyBinner:
+        def fit(self, df):
+            return DensityEstimationTree().fit(df)
+
+    assert isinstance(DensityEstimationTree(), Binner)
+    assert isinstance(as_binner(LegacyBinner()), FrameBinnerAdapter)
+    data = cauchy_mixture(size=300, seed=0)
+    legacy = shm.Shmistogram(data, binner=LegacyBinner())
+    native = shm.Shmistogram(data)
+    pd.testing.assert_frame_equal(legacy.bins, native.bins)
+
+
+def test_arrays_binner_without_capabilities():
+    """A binner with only a fit_arrays() method is used directly, with the default capabilities."""
+
+    class ArraysOnly:
+        def fit_arrays(self, values, counts):
+            return DensityEstimationTree().fit_arrays(values, counts)
+
+    binner = ArraysOnly()
+    assert as_binner(binner) is binner
+    assert capabilities(binner) == BinnerCapabilities()
+    data = cauchy_mixture(size=300, seed=0)
+    pd.testing.assert_frame_equal(shm.Shmistogram(data, binner=binner).bins, shm.Shmistogram(data).bins)
+
+
+def test_legacy_binner_receives_values_unconverted():
+    """Values reach a legacy binner in their own dtype, which need not be numeric."""
+    dtypes = []
+
+    class RecordingBinner:
+        def fit(self, df):
+            dtypes.append(df.index.dtype)
+            return pd.DataFrame({LB: [0.0], UB: [1.0], FREQ: [df[COUNT].sum()], WIDTH: [1.0], RATE: [1.0]})
+
+    shm.Shmistogram(list("abcdefghij") + ["z"] * 30, binner=RecordingBinner())
+    shm.Shmistogram(np.arange(100).repeat(2), binner=RecordingBinner())
+    assert pd.api.types.is_string_dtype(dtypes[0])
+    assert dtypes[1] == np.int64
+
+
+def test_binners_declaring_weight_support_fit_fractional_weights():
+    values = np.unique(cauchy_mixture(size=2000, seed=0))
+    weights = np.full(values.shape, 1 / values.shape[0])
+    for binner in [DensityEstimationTree(), Agglomerator(), Agglomerator(batch=True), BayesianBlocks()]:
+        if not binner.capabilities.supports_weights:
+            continue
+        bins = binner.fit_arrays(values, weights)
+        assert bins.freq.sum() == pytest.approx(1)
+        assert (bins.lb.iloc[0], bins.ub.iloc[-1]) == (values[0], values[-1])
+
+
+def test_batched_agglomeration_honors_n_bins():
+    data = cauchy_mixture(size=3000, truncate=True, seed=0)
+    exact = shm.Shmistogram(data, binner=Agglomerator(n_bins=12, prebin_maxbins=500))
+    batched = shm.Shmistogram(data, binner=Agglomerator(n_bins=12, prebin_maxbins=500, batch=True))
+    assert exact.bins is not None and batched.bins is not None
+    assert batched.bins.shape[0] == exact.bins.shape[0] == 12
+    assert batched.bins.freq.sum() == exact.bins.freq.sum()
+    assert (batched.bins.lb.to_numpy()[1:] == batched.bins.ub.to_numpy()[:-1]).all()
+
+
+def test_shmistogram_releases_binner_data():
+    """By default the binner drops its copy of the crowd data once the bins are fit."""
+    data = cauchy_mixture(size=2000, seed=0)
+    lean = shm.Shmistogram(data)
+    full = shm.Shmistogram(data, release_binner_data=False)
+    assert not hasattr(lean.binner, "df") and not hasattr(lean.binner, "nodes")
+    assert hasattr(full.binner, "df")
+    pd.testing.assert_frame_equal(lean.bins, full.bins)
+    assert lean.bins is not None
+    assert (lean.binner.edges[1:] == lean.bins.ub.to_numpy()).all()
+    assert len(pickle.dumps(lean)) < len(pickle.dumps(full))
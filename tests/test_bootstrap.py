@@ -0,0 +1,28 @@
+import numpy as np
+
+import shmistogram as sh
+from shmistogram.bootstrap import bootstrap_bands
+from shmistogram.simulations.univariate import cauchy_mixture
+
+
+def test_bootstrap_bands():
+    data = np.concatenate([cauchy_mixture(size=400, seed=0), [0.0] * 40, [np.nan] * 10])
+    shm = sh.Shmistogram(data)
+    assert shm.bins is not None
+    bands = bootstrap_bands(shm, n_replicates=8, seed=0, max_workers=1)
+    assert bands.rates.shape == (8, shm.bins.shape[0])
+    assert (bands.bins["rate_q0.05"] <= bands.bins["rate_q0.95"]).all()
+    np.testing.assert_allclose(bands.shares.sum(axis=1), 1)
+    # The sampling distribution of the shares is centered on the observed shares
+    np.testing.assert_allclose(bands.loner_crowd_shares.loc[0.5], shm.loner_crowd_shares, atol=0.05)
+
+    # Replicates are seeded individually, so the pool size does not change the results
+    pooled = bootstrap_bands(shm, n_replicates=8, seed=0, max_workers=2)
+    np.testing.assert_array_equal(pooled.rates, bands.rates)
+
+
+def test_bootstrap_bands_of_narrow_integers():
+    shm = sh.Shmistogram(np.arange(-100, 101).astype(np.int8))
+    assert shm.bins is not None
+    bands = bootstrap_bands(shm, n_replicates=4, seed=0, max_workers=1)
+    assert bands.rates.shape == (4, shm.bins.shape[0])
@@ -0,0 +1,65 @@
+import pandas as pd
+import pytest
+
+import shmistogram as sh
+from shmistogram.binners.det import DensityEstimationTree
+from shmistogram.simulations.univariate import cauchy_mixture
+
+
+def test_cache_hits_and_keys(tmp_path):
+    data = cauchy_mixture(size=500, seed=0)
+    cache = sh.ShmistogramCache(directory=tmp_path)
+    first = cache.get_or_fit(data)
+    assert cache.get_or_fit(data.copy()) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Different binner settings are a different fit
+    other = cache.get_or_fit(data, binner=DensityEstimationTree(n_bins=3))
+    assert other is not first
+    assert other.bins is not None and other.bins.shape[0] == 3
+
+    # The on-disk store survives clearing the in-memory store
+    cache.clear()
+    restored = cache.get_or_fit(data)
+    assert restored is not first
+    assert first.bins is not None
+    pd.testing.assert_frame_equal(restored.bins, first.bins)
+    assert cache.misses == 2
+
+
+def test_cache_eviction():
+    cache = sh.ShmistogramCache(max_bytes=1)
+    for seed in range(3):
+        cache.get_or_fit(cauchy_mixture(size=200, seed=seed))
+    assert len(cache) == 1
+
+
+class PrivateBinner:
+    """Stores its parameter under another name, so its settings cannot be read back."""
+
+    def __init__(self, n_bins):
+        self._n_bins = n_bins
+
+    def fit(self, df):
+        return DensityEstimationTree(n_bins=self._n_bins).fit(df)
+
+
+class KeyedBinner(PrivateBinner):
+    def cache_key(self):
+        return f"n_bins={self._n_bins}"
+
+
+def test_cache_refuses_binners_it_cannot_fingerprint():
+    data = cauchy_mixture(size=500, seed=0)
+    cache = sh.ShmistogramCache()
+    with pytest.warns(UserWarning, match="cannot be fingerprinted"):
+        three = cache.get_or_fit(data, binner=PrivateBinner(3))
+    with pytest.warns(UserWarning):
+        five = cache.get_or_fit(data, binner=PrivateBinner(5))
+    assert three.bins is not None and five.bins is not None
+    assert (three.bins.shape[0], five.bins.shape[0]) == (3, 5)
+    assert len(cache) == 0
+
+    keyed = cache.get_or_fit(data, binner=KeyedBinner(3))
+    assert cache.get_or_fit(data, binner=KeyedBinner(3)) is keyed
+    assert cache.get_or_fit(data, binner=KeyedBinner(5)) is not keyed
@@ -0,0 +1,22 @@
+import numpy as np
+
+from shmistogram.binners import calibration
+from shmistogram.binners.bayesblocks import BayesianBlocks
+from shmistogram.simulations.univariate import cauchy_mixture
+
+
+def test_calibrated_bayesian_blocks(tmp_path, monkeypatch):
+    monkeypatch.setattr(calibration, "N_SIMULATIONS", 200)
+    calibration.ncp_prior_table.cache_clear()
+    try:
+        priors = [calibration.calibrated_ncp_prior(n, 0.05, tmp_path) for n in [8, 100, 10**4, 10**6]]
+        assert list(tmp_path.glob("*.npy"))
+        # Larger samples need a larger prior to hold the false-positive rate; astropy's fit to simulations is similar
+        assert np.all(np.diff(priors) > 0)
+        assert abs(priors[1] - (4 - np.log(73.53 * 0.05 * 100**-0.478))) < 0.5
+        values, counts = np.unique(cauchy_mixture(size=2000, truncate=True, seed=0), return_counts=True)
+        bins = BayesianBlocks(false_positive_rate=0.05, calibration_dir=tmp_path).fit_arrays(values, counts)
+        assert bins.shape[0] > 1
+        assert bins.freq.sum() == counts.sum()
+    finally:
+        calibration.ncp_prior_table.cache_clear()
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+import shmistogram as sh
+from shmistogram.compare import (
+    MixtureMeasure,
+    compare_pairs,
+    js_divergence,
+    kl_divergence,
+    ks_statistic,
+    total_variation,
+    wasserstein,
+)
+from shmistogram.simulations.univariate import cauchy_mixture
+
+
+def uniform(lb, ub, atoms=(), atom_mass=(), null_mass=0.0):
+    crowd_mass = 1 - sum(atom_mass) - null_mass
+    return MixtureMeasure(
+        edges=np.array([lb, ub], dtype=float),
+        bin_mass=np.array([crowd_mass]),
+        atoms=np.array(atoms, dtype=float),
+        atom_mass=np.array(atom_mass, dtype=float),
+        null_mass=null_mass,
+    )
+
+
+def test_metrics_on_shifted_uniforms():
+    p, q = uniform(0, 1), uniform(0.5, 1.5)
+    assert total_variation(p, q) == pytest.approx(0.5)
+    assert js_divergence(p, q) == pytest.approx(0.5 * np.log(2))
+    assert kl_divergence(p, q) == np.inf
+    assert wasserstein(p, q) == pytest.approx(0.5)
+    assert ks_statistic(p, q) == pytest.approx(0.5)
+
+
+def test_metrics_with_loners_and_nulls():
+    p = uniform(0, 1, atoms=[0.5], atom_mass=[0.5])
+    q = uniform(0, 1, null_mass=0.5)
+    assert total_variation(p, q) == pytest.approx(0.5)
+    assert kl_divergence(q, p) == np.inf  # q has null mass where p has none
+    # Without nulls q is uniform on [0, 1], and p moves half its mass to the atom at 0.5
+    assert ks_statistic(p, q) == pytest.approx(0.25)
+    assert wasserstein(p, q) == pytest.approx(0.125)
+
+
+def test_fitted_shmistograms():
+    a = sh.Shmistogram(np.concatenate([cauchy_mixture(size=1000, seed=0), [0.0] * 30]))
+    b = sh.Shmistogram(np.concatenate([cauchy_mixture(size=1000, seed=1) + 0.5, [np.nan] * 30]))
+    for metric in ["total_variation", "js_divergence", "wasserstein", "ks_statistic"]:
+        distances = compare_pairs([(a, a), (a, b)], metric=metric)
+        assert distances[0] == pytest.approx(0, abs=1e-12)
+        assert distances[1] > 0
+    assert total_variation(a, b) <= 1
+    assert js_divergence(a, b) <= np.log(2)
+
+
+def test_compare_pairs_from_generator():
+    # Each Shmistogram is freed once its pair is consumed, so CPython may give its id to a later one
+    rng = np.random.default_rng(0)
+    data = [rng.normal(size=200) + shift for shift in np.linspace(0, 4, 40)]
+    base = sh.Shmistogram(data[0])
+    distances = compare_pairs(((base, sh.Shmistogram(x)) for x in data), metric="total_variation")
+    expected = [total_variation(base, sh.Shmistogram(x)) for x in data]
+    np.testing.assert_allclose(distances, expected)
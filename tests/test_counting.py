@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandahandler.tabulation import tabulate
+
+import shmistogram as sh
+from shmistogram.counting import fast_tabulate
+
+rng = np.random.default_rng(0)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        rng.integers(-5, 100, 1000),  # bincount path
+        rng.integers(0, 10**9, 1000),  # wide integers take the np.unique path
+        rng.integers(0, 100, 1000).astype(np.uint8),
+        np.arange(-100, 101).astype(np.int8),  # the range overflows int8
+        rng.integers(-30000, 30000, 70000).astype(np.int16),
+        np.concatenate([rng.normal(size=100), [np.nan] * 5, [0.0] * 3]),
+        pd.Series(rng.integers(0, 5, 50), name="x"),
+        ["a", "b", "a", None],  # falls back to pandahandler
+        np.array([], dtype=float),
+    ],
+)
+def test_fast_tabulate_matches_pandahandler(data):
+    expected = tabulate(data)
+    result = fast_tabulate(data)
+    pd.testing.assert_series_equal(result.counts, expected.counts)
+    assert (result.name, result.n_values, result.n_distinct) == (expected.name, expected.n_values, expected.n_distinct)
+
+
+def test_shmistogram_of_narrow_integers():
+    data = np.arange(-100, 101).astype(np.int8)
+    shm = sh.Shmistogram(data)
+    assert shm.bins is not None
+    assert (shm.bins.lb.iloc[0], shm.bins.ub.iloc[-1], shm.bins.freq.sum()) == (-100, 100, 201)
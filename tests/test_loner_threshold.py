@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+from pandahandler.tabulation import tabulate
+from scipy.special import xlogy
+
+from shmistogram import Shmistogram
+from shmistogram.loner_threshold import _grid, loner_threshold_scores
+
+
+def test_scores_match_refitting_each_threshold():
+    """The incremental log likelihoods equal those computed from scratch for each threshold."""
+    rng = np.random.default_rng(0)
+    data = np.concatenate([np.round(rng.normal(size=3000), 2), [0.5] * 25, [np.nan] * 10])
+    counts = tabulate(data)
+    scores = loner_threshold_scores(counts)
+    series = counts.counts.loc[counts.counts.index.notna()]
+    values, freq = series.index.to_numpy(dtype=float), series.to_numpy()
+    n = freq.sum()
+    delta = np.median(np.diff(values))
+    bin_of, width = _grid(values, delta)
+    for threshold, n_loners, log_likelihood in zip(scores.threshold, scores.n_loners, scores.log_likelihood):
+        is_loner = freq >= threshold
+        crowd = np.bincount(bin_of[~is_loner], weights=freq[~is_loner], minlength=width.shape[0])
+        expected = xlogy(crowd, crowd * delta / (n * width)).sum() + xlogy(freq[is_loner], freq[is_loner] / n).sum()
+        assert n_loners == is_loner.sum()
+        assert np.isclose(log_likelihood, expected)
+
+
+def test_auto_finds_planted_point_masses():
+    rng = np.random.default_rng(1)
+    data = np.concatenate([rng.triangular(-10, -10, 70, size=500), [0] * 40, [42] * 20, [np.nan] * 100])
+    shm = Shmistogram(data, loner_min_count="auto")
+    pd.testing.assert_index_equal(shm.loners.counts.index, pd.Index([0.0, 42.0, np.nan], name=shm.loners.name))
+    # Continuous data has no loners
+    continuous = Shmistogram(rng.normal(size=5000), loner_min_count="auto")
+    assert continuous.n_loners == 0
+
+
+def test_auto_with_few_distinct_values():
+    """Too few distinct values to score thresholds falls back to the default threshold."""
+    for data in [[1, 1, 1, 2, 2, 2], [1.0] * 10 + [np.nan] * 3, [np.nan] * 4]:
+        assert Shmistogram(data, loner_min_count="auto").loner_min_count == Shmistogram(data).loner_min_count
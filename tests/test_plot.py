@@ -0,0 +1,48 @@
+import numpy as np
+from matplotlib import pyplot as plt
+from matplotlib.collections import LineCollection
+
+import shmistogram as sh
+from shmistogram.render import render, render_many
+
+
+def test_loner_decimation_is_bounded_by_pixels():
+    rng = np.random.default_rng(0)
+    loner_values = rng.integers(0, 10**6, 20_000) / 1000
+    data = np.concatenate([rng.normal(size=500), np.repeat(loner_values, 3)])
+    shm = sh.Shmistogram(data, loner_min_count=3)
+    fig, ax = plt.subplots(figsize=(4, 3), dpi=100)
+    shm.plot(ax=ax)
+    collection = ax.figure.axes[-1].collections[0]
+    assert isinstance(collection, LineCollection)
+    lines = collection.get_segments()
+    assert len(lines) <= ax.get_window_extent().width + 1
+    # The tallest loner survives decimation
+    assert max(segment[1][1] for segment in lines) == shm.loners.counts.max()
+    plt.close(fig)
+
+
+def test_render_many(tmp_path):
+    shms = [sh.Shmistogram(np.random.default_rng(seed).normal(size=300)) for seed in range(3)]
+    outfiles = [tmp_path / f"{k}.png" for k in range(3)]
+    n_pyplot_figures = len(plt.get_fignums())
+    render_many(shms, outfiles, max_workers=1, dpi=50)
+    render(shms[0], tmp_path / "again.png", dpi=50)
+    assert all(f.stat().st_size > 0 for f in outfiles)
+    assert (tmp_path / "again.png").read_bytes() == outfiles[0].read_bytes()
+    assert len(plt.get_fignums()) == n_pyplot_figures  # nothing leaked into pyplot
+
+
+def test_render_all_loners(tmp_path):
+    status_codes = sh.Shmistogram(np.repeat([200, 404, 500], 50))
+    all_null = sh.Shmistogram(np.full(20, np.nan))
+    assert status_codes.bins is None and all_null.bins is None
+    outfiles = [tmp_path / "codes.png", tmp_path / "null.png"]
+    render_many([status_codes, all_null], outfiles, max_workers=1, dpi=50)
+    assert all(f.stat().st_size > 0 for f in outfiles)
+    fig, ax = plt.subplots()
+    status_codes.plot(ax=ax)
+    collection = ax.collections[0]  # drawn on the primary axis
+    assert isinstance(collection, LineCollection)
+    assert [segment[1][1] for segment in collection.get_segments()] == [50, 50, 50]
+    plt.close(fig)
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from shmistogram import Shmistogram
+from shmistogram.query import QueryIndex
+
+
+def _fixture():
+    rng = np.random.default_rng(0)
+    atoms = rng.choice(np.round(rng.normal(size=60), 1), size=3000)
+    data = np.concatenate([rng.normal(size=2000), atoms, [np.nan] * 50])
+    return data, Shmistogram(data, loner_min_count=5)
+
+
+def test_range_mass_matches_brute_force():
+    data, shm = _fixture()
+    index = shm.query_index
+    assert isinstance(index, QueryIndex) and shm.query_index is index
+    a = np.array([-np.inf, -1.0, 0.0, 0.5, 2.0, 1.0])
+    b = np.array([np.inf, 1.0, 0.0, 0.25, 3.0, 1.0])
+    masses = index.range_masses(a, b)
+    assert np.isclose(masses[0], 1 - 50 / data.shape[0])
+    assert masses[3] == 0
+    # Loners are counted exactly; the crowd only approximately, by its piecewise-uniform density
+    loners = shm.loners.counts.loc[shm.loners.counts.index.notna()]
+    values = loners.index.to_numpy()
+    assert shm.bins is not None
+    for lo, hi, mass in zip(a, b, masses):
+        in_range = (values >= lo) & (values <= hi)
+        exact = np.sum((data >= lo) & (data <= hi)) / data.shape[0]
+        crowd = mass - loners.to_numpy()[in_range].sum() / data.shape[0]
+        assert crowd >= -1e-12
+        assert abs(mass - exact) < 0.02
+        assert np.isclose(index.range_mass(lo, hi), mass)
+
+
+def test_top_k_matches_sorting():
+    _, shm = _fixture()
+    loners = shm.loners.counts.loc[shm.loners.counts.index.notna()]
+    rng = np.random.default_rng(1)
+    for _ in range(50):
+        lo, hi = np.sort(rng.normal(size=2) * 2)
+        k = int(rng.integers(0, 10))
+        in_range = loners.loc[(loners.index >= lo) & (loners.index <= hi)]
+        expected = in_range.iloc[np.lexsort((in_range.index.to_numpy(), -in_range.to_numpy()))].iloc[:k]
+        result = shm.query_index.top_k(lo, hi, k)
+        np.testing.assert_array_equal(result.index.to_numpy(), expected.index.to_numpy())
+        np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+    assert shm.query_index.top_k(10.0, 11.0, 5).empty
+    assert isinstance(shm.query_index.top_k(-10.0, 10.0, 3), pd.Series)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from shmistogram.binners.det2d import DensityEstimationTree2D
+from shmistogram.shmistogram2d import Shmistogram2D
+
+
+def test_shmistogram2d():
+    rng = np.random.default_rng(0)
+    x = np.concatenate([rng.normal(size=2000), [0.0] * 40, [np.nan] * 5])
+    y = np.concatenate([rng.exponential(size=2000), [1.0] * 40, [2.0] * 5])
+    shm = Shmistogram2D(x, y)
+    loners = shm.loners[["x", "y"]].to_numpy()
+    assert loners[0].tolist() == [0.0, 1.0]
+    assert np.isnan(loners[-1, 0])
+    np.testing.assert_allclose(shm.loner_crowd_shares, [45 / 2045, 2000 / 2045])
+    assert shm.bins is not None
+    assert shm.bins["freq"].sum() == 2000
+    assert (shm.bins["area"] > 0).all()
+    # The density is much higher near y=0 than in the exponential tail
+    near_zero = shm.bins[shm.bins["y_lb"] < 0.1]
+    assert near_zero["rate"].max() > 10 * shm.bins["rate"].min()
+
+
+def test_det2d_n_bins():
+    rng = np.random.default_rng(1)
+    xy = rng.uniform(size=(500, 2))
+    bins = DensityEstimationTree2D(n_bins=7).fit_arrays(xy, np.ones(500, dtype=int))
+    assert bins.shape[0] == 7
+    assert bins["freq"].sum() == 500
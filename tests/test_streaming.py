@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shmistogram as sh
+from shmistogram.counting import fast_tabulate
+from shmistogram.simulations.univariate import cauchy_mixture
+from shmistogram.streaming import tabulate_source
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([np.round(cauchy_mixture(size=2000, seed=0), 2), [0.0] * 50, [np.nan] * 30])
+    return rng.permutation(values)
+
+
+def test_paged_tabulation_matches_in_memory(data, tmp_path):
+    path = tmp_path / "data.npy"
+    np.save(path, data)
+    expected = fast_tabulate(data)
+    for source in [path, np.load(path, mmap_mode="r")]:
+        result = tabulate_source(source, page_size=128)
+        pd.testing.assert_series_equal(result.counts, expected.counts, check_index_type=False)
+        assert result.n_values == expected.n_values
+
+
+def test_paged_tabulation_of_narrow_integers(tmp_path):
+    data = np.random.default_rng(0).integers(-30000, 30000, 100_000).astype(np.int16)
+    path = tmp_path / "data.npy"
+    np.save(path, data)
+    # Pages wide enough for the bincount path, whose offsets overflow int16
+    result = tabulate_source(path, page_size=65536)
+    pd.testing.assert_series_equal(result.counts, fast_tabulate(data).counts, check_index_type=False)
+
+
+def test_shmistogram_from_arrow_file(data, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / "data.arrow"
+    column = pa.array(data, from_pandas=True)  # NaN becomes an Arrow null
+    table = pa.table({"x": column})
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table, max_chunksize=300)
+    expected = sh.Shmistogram(data)
+    result = sh.Shmistogram(str(path))
+    assert expected.bins is not None and result.bins is not None
+    pd.testing.assert_frame_equal(result.bins, expected.bins)
+    np.testing.assert_array_equal(result.loner_crowd_shares, expected.loner_crowd_shares)
+    assert result.loners.counts.iloc[-1] == 30  # the nulls
@@ -0,0 +1,30 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from shmistogram.validation import ENV_VAR, FAST, FULL, full_validation, get_validation_level, validation
+
+
+def test_validation_levels():
+    # tests/conftest.py sets the full level for the whole test run
+    assert get_validation_level() == FULL
+    with validation(FAST):
+        assert not full_validation()
+        with validation(FULL):
+            assert full_validation()
+        assert not full_validation()
+    assert full_validation()
+    with pytest.raises(ValueError), validation("paranoid"):  # pyright: ignore[reportArgumentType]
+        pass
+
+
+def test_validation_level_from_environment():
+    code = "from shmistogram.validation import get_validation_level; print(get_validation_level())"
+    for env_level, expected in [(None, FAST), (FULL, FULL)]:
+        env = {k: v for k, v in os.environ.items() if k != ENV_VAR}
+        if env_level is not None:
+            env[ENV_VAR] = env_level
+        result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == expected